@@ -1,38 +1,70 @@
 import os
-os.environ['DJANGO_SETTINGS_MODULE'] = 'eduplanners.settings'
-import django
-django.setup()
-
-from core.models import Semester, ClassSection, SystemConfiguration
-
-print('=== SEMESTERS ===')
-for s in Semester.objects.select_related('department').all():
-    print(f'  S{s.number} - Dept: {s.department.code}')
-
-print()
-print('=== CLASSES (ClassSection) ===')
-classes = ClassSection.objects.select_related('semester__department').all()
-if classes.exists():
-    for c in classes:
-        print(f'  {c.name} - S{c.semester.number} ({c.semester.department.code})')
-else:
-    print('  No classes found!')
-
-print()
-print('=== SYSTEM CONFIG ===')
-config = SystemConfiguration.objects.first()
-if config:
-    print(f'  Active Semester Type: {config.active_semester_type}')
-    print(f'  Academic Year: {config.academic_year}')
-else:
-    print('  No config found!')
-
-# Check specifically for ODD semester classes
-print()
-print('=== CLASSES IN ODD SEMESTERS (1,3,5,7) ===')
-odd_classes = ClassSection.objects.filter(semester__number__in=[1, 3, 5, 7])
-if odd_classes.exists():
-    for c in odd_classes.select_related('semester__department'):
-        print(f'  {c.name} - S{c.semester.number} ({c.semester.department.code})')
-else:
-    print('  No classes in ODD semesters!')
+import sys
+
+
+def write_lines(lines):
+    """Write a block of lines to stdout in a single call"""
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
+
+
+def main():
+    from django.db.models import Count
+    from core.models import Semester, ClassSection, SystemConfiguration
+
+    print('=== SEMESTERS ===')
+    semesters = Semester.objects.annotate(
+        class_count=Count('sections')
+    ).order_by('department__code', 'number').values_list('number', 'department__code', 'class_count')
+    write_lines([
+        f'  S{number} - Dept: {dept_code} ({class_count} classes)'
+        for number, dept_code, class_count in semesters
+    ])
+
+    print()
+    print('=== CLASSES (ClassSection) ===')
+    # Stream rows and keep only the formatted lines; the odd-semester listing
+    # is collected in the same pass instead of querying again
+    class_lines = []
+    odd_class_lines = []
+    classes = ClassSection.objects.values_list('name', 'semester__number', 'semester__department__code')
+    for name, number, dept_code in classes.iterator(chunk_size=2000):
+        line = f'  {name} - S{number} ({dept_code})'
+        class_lines.append(line)
+        if number & 1:
+            odd_class_lines.append(line)
+
+    if class_lines:
+        write_lines(class_lines)
+    else:
+        print('  No classes found!')
+
+    print()
+    print('=== SYSTEM CONFIG ===')
+    config = SystemConfiguration.objects.values('active_semester_type', 'current_academic_year').first()
+    if config:
+        print(f"  Active Semester Type: {config['active_semester_type']}")
+        print(f"  Academic Year: {config['current_academic_year']}")
+    else:
+        print('  No config found!')
+
+    # Check specifically for ODD semester classes
+    print()
+    print('=== CLASSES IN ODD SEMESTERS (1,3,5,7) ===')
+    if odd_class_lines:
+        write_lines(odd_class_lines)
+    else:
+        print('  No classes in ODD semesters!')
+
+
+if __name__ == '__main__':
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'eduplanner.settings')
+    import django
+    django.setup()
+
+    from django.db import connection, transaction
+
+    # Read every section from one consistent snapshot
+    with transaction.atomic():
+        main()
+    connection.close()
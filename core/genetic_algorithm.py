@@ -6,19 +6,30 @@ workload-balanced academic timetables for KTU University.
 
 Chromosome Encoding:
     Each chromosome represents a complete timetable for all classes in a semester.
-    Gene = (class_id, subject_id, faculty_id, time_slot_id)
+    Genes are stored column-wise as parallel NumPy arrays (class_idx, subject_idx,
+    faculty_idx, slot_idx, is_lab, assistant_idx); position i of every column is
+    one timetable entry, holding indices into the GA's loaded data.
     
 Fitness Function considers:
     - Hard constraints (must satisfy): faculty clash, class clash, workload limits, lab continuity
     - Soft constraints (try to satisfy): faculty preferences, workload balance, subject rotation
 """
 
-import random
-import copy
+import os
 from collections import defaultdict
-from typing import List, Dict, Tuple, Optional
-from dataclasses import dataclass, field
-from django.db.models import Q
+from functools import lru_cache
+from typing import List, Tuple, Optional
+from dataclasses import dataclass
+
+import numpy as np
+from django.db import connection, transaction
+from django.db.models import F, Q
+
+try:
+    from numba import config as numba_config, njit, prange
+except ImportError:  # numba is optional; fitness falls back to NumPy
+    njit = None
+    prange = range
 
 
 @dataclass
@@ -34,15 +45,240 @@ class Gene:
 
 @dataclass
 class Chromosome:
-    """Represents a complete timetable solution"""
-    genes: List[Gene] = field(default_factory=list)
+    """
+    Represents a complete timetable solution
+
+    Genes are stored column-wise: position i of every array describes one
+    timetable entry. Values are indices into the GA's classes, subjects,
+    faculties and time_slots lists; assistant_idx is -1 when a gene has no
+    assistant faculty.
+
+    Every chromosome built by a GeneticAlgorithm shares the same layout: genes
+    are grouped by class, and the class, subject and lab flag at each position
+    never change. Operators only move slots and faculty around.
+
+    Chromosomes in a population may be shared (elites, best-so-far), so the
+    genetic operators copy before they write. The one exception is mutating
+    a crossover child that nothing else refers to yet.
+    """
+    class_idx: np.ndarray
+    subject_idx: np.ndarray
+    faculty_idx: np.ndarray
+    slot_idx: np.ndarray
+    is_lab: np.ndarray
+    assistant_idx: np.ndarray
     fitness: float = 0.0
+    dirty: bool = True  # genes changed since fitness was last calculated
+    
+    GENE_FIELDS = ('class_idx', 'subject_idx', 'faculty_idx', 'slot_idx', 'is_lab', 'assistant_idx')
+    
+    def __len__(self):
+        return len(self.class_idx)
     
     def copy(self):
         return Chromosome(
-            genes=[Gene(**g.__dict__) for g in self.genes],
-            fitness=self.fitness
+            class_idx=self.class_idx.copy(),
+            subject_idx=self.subject_idx.copy(),
+            faculty_idx=self.faculty_idx.copy(),
+            slot_idx=self.slot_idx.copy(),
+            is_lab=self.is_lab.copy(),
+            assistant_idx=self.assistant_idx.copy(),
+            fitness=self.fitness,
+            dirty=self.dirty
         )
+    
+    @classmethod
+    def blend(cls, base, donor, mask):
+        """Build a chromosome taking genes from donor where mask is set and from base elsewhere"""
+        return cls(**{
+            name: np.where(mask, getattr(donor, name), getattr(base, name))
+            for name in cls.GENE_FIELDS
+        })
+
+
+def _slot_bitset(n_rows: int, n_slots: int) -> np.ndarray:
+    """Empty occupancy bitmap: one bit per slot, packed 64 to a word"""
+    return np.zeros((n_rows, (n_slots + 63) // 64), dtype=np.uint64)
+
+
+def _bits_set(row: np.ndarray, slots: np.ndarray) -> np.ndarray:
+    """Whether each slot's bit is set in a bitmap row"""
+    shifts = (slots & 63).astype(np.uint64)
+    return ((row[slots >> 6] >> shifts) & np.uint64(1)).astype(bool)
+
+
+def _set_bits(row: np.ndarray, slots: np.ndarray) -> None:
+    """Set each slot's bit in a bitmap row, in place"""
+    shifts = (slots & 63).astype(np.uint64)
+    np.bitwise_or.at(row, slots >> 6, np.uint64(1) << shifts)
+
+
+def _count_repeats(keys: np.ndarray) -> int:
+    """Number of entries in keys that repeat an earlier value"""
+    counts = np.bincount(keys)
+    return int(keys.size - np.count_nonzero(counts))
+
+
+# Order of GeneticAlgorithm.WEIGHTS entries passed to the fitness kernel
+KERNEL_WEIGHTS = (
+    'faculty_clash', 'class_clash', 'workload_exceeded', 'lab_continuity',
+    'lab_timing', 'subject_rotation', 'faculty_preference', 'workload_balance',
+)
+
+
+def _fitness_kernel(class_idx, subject_idx, faculty_idx, slot_idx, is_lab, assistant_idx,
+                    n_classes, n_subjects, n_faculty, n_slots, slot_day, slot_period,
+                    pref_matrix, history_matrix, workload_limits, weights, cutoff):
+    """
+    Loop form of GeneticAlgorithm.calculate_fitness over flat arrays.
+    
+    Compiled with numba when it is installed; weights follow KERNEL_WEIGHTS.
+    Returns early, with a partial score, once the result is sure to fall
+    below cutoff.
+    """
+    n_genes = class_idx.shape[0]
+    best_bonus = max(weights[6], 0.0)
+    fitness = 0.0
+    # Occupancy bitmaps, one bit per slot packed 64 to a word, so each clash
+    # check is a shift, an AND and an OR
+    n_words = (n_slots + 63) // 64
+    faculty_busy = np.zeros((n_faculty, n_words), np.uint64)
+    class_busy = np.zeros((n_classes, n_words), np.uint64)
+    hours = np.zeros(n_faculty, np.int64)
+    
+    for i in range(n_genes):
+        f = faculty_idx[i]
+        t = slot_idx[i]
+        word = t >> 6
+        bit = np.uint64(1) << np.uint64(t & 63)
+        
+        # Faculty clash (main, then assistant)
+        if faculty_busy[f, word] & bit:
+            fitness += weights[0]
+        faculty_busy[f, word] |= bit
+        hours[f] += 1
+        
+        a = assistant_idx[i]
+        if a >= 0:
+            if faculty_busy[a, word] & bit:
+                fitness += weights[0]
+            faculty_busy[a, word] |= bit
+            hours[a] += 1
+        
+        # Class clash
+        c = class_idx[i]
+        if class_busy[c, word] & bit:
+            fitness += weights[1]
+        class_busy[c, word] |= bit
+        
+        # Subject rotation and faculty preference
+        if history_matrix[f, subject_idx[i]]:
+            fitness += weights[5]
+        if pref_matrix[f, subject_idx[i]]:
+            fitness += weights[6]
+        
+        # Only preference bonuses can raise the score from here on
+        if fitness + best_bonus * (n_genes - 1 - i) < cutoff:
+            return fitness
+    
+    # Workload limits and balance
+    busy_count = 0
+    total_hours = 0
+    for f in range(n_faculty):
+        if hours[f] > workload_limits[f]:
+            fitness += weights[2] * (hours[f] - workload_limits[f])
+        if hours[f] > 0:
+            busy_count += 1
+            total_hours += hours[f]
+    if busy_count > 0:
+        avg_hours = total_hours / busy_count
+        for f in range(n_faculty):
+            if hours[f] > 0:
+                deviation = abs(hours[f] - avg_hours)
+                if deviation > 5:
+                    fitness += weights[7] * (deviation - 5)
+    if fitness < cutoff:
+        return fitness
+    
+    # Lab constraints per (class, lab subject) group
+    lab_positions = np.nonzero(is_lab)[0]
+    group_keys = class_idx[lab_positions].astype(np.int64) * n_subjects + subject_idx[lab_positions]
+    order = np.argsort(group_keys)
+    start = 0
+    while start < order.shape[0]:
+        end = start + 1
+        while end < order.shape[0] and group_keys[order[end]] == group_keys[order[start]]:
+            end += 1
+        
+        # Timing: all slots in the morning or all in the afternoon
+        all_morning = True
+        all_afternoon = True
+        for k in range(start, end):
+            period = slot_period[slot_idx[lab_positions[order[k]]]]
+            if period > 3:
+                all_morning = False
+            if period < 5:
+                all_afternoon = False
+        if not (all_morning or all_afternoon):
+            fitness += weights[4]
+        
+        # Continuity: 3 distinct slots on one day in consecutive periods
+        continuous = False
+        if end - start == 3:
+            s0 = slot_idx[lab_positions[order[start]]]
+            s1 = slot_idx[lab_positions[order[start + 1]]]
+            s2 = slot_idx[lab_positions[order[start + 2]]]
+            if s0 != s1 and s1 != s2 and s0 != s2 and \
+               slot_day[s0] == slot_day[s1] and slot_day[s1] == slot_day[s2]:
+                p0 = slot_period[s0]
+                p1 = slot_period[s1]
+                p2 = slot_period[s2]
+                low = min(p0, min(p1, p2))
+                high = max(p0, max(p1, p2))
+                continuous = high - low == 2
+        if not continuous:
+            fitness += weights[3]
+        
+        start = end
+    
+    return fitness
+
+
+_compiled_fitness_kernel = njit(cache=True)(_fitness_kernel) if njit else None
+
+
+def _population_fitness_kernel(class_idx, subject_idx, faculty_idx, slot_idx, is_lab, assistant_idx,
+                               n_classes, n_subjects, n_faculty, n_slots, slot_day, slot_period,
+                               pref_matrix, history_matrix, workload_limits, weights, cutoff):
+    """
+    Fitness of every row of a population at once.
+    
+    class_idx, subject_idx and is_lab hold the shared gene layout; the other
+    gene columns are (population, genes) matrices. Rows are scored in
+    parallel threads (NUMBA_NUM_THREADS) when compiled.
+    """
+    n_pop = faculty_idx.shape[0]
+    fitness = np.empty(n_pop, np.float64)
+    for p in prange(n_pop):
+        fitness[p] = _compiled_fitness_kernel(
+            class_idx, subject_idx, faculty_idx[p], slot_idx[p], is_lab, assistant_idx[p],
+            n_classes, n_subjects, n_faculty, n_slots, slot_day, slot_period,
+            pref_matrix, history_matrix, workload_limits, weights, cutoff
+        )
+    return fitness
+
+
+# Generation runs on background threads, and TBB (numba's first threading
+# layer choice) hangs interpreter shutdown once it was started off the main
+# thread. The layer is picked when the parallel kernel first runs, so prefer
+# OpenMP before that happens; NUMBA_THREADING_LAYER_PRIORITY in the
+# environment takes precedence.
+if njit and 'NUMBA_THREADING_LAYER_PRIORITY' not in os.environ:
+    numba_config.THREADING_LAYER_PRIORITY = ['omp', 'tbb', 'workqueue']
+
+_compiled_population_kernel = (
+    njit(cache=True, parallel=True)(_population_fitness_kernel) if njit else None
+)
 
 
 class GeneticAlgorithm:
@@ -71,6 +307,18 @@ class GeneticAlgorithm:
         'workload_balance': -30,     # Soft: Penalize uneven distribution
     }
     
+    # Share of the initial population built by the greedy constructor, and
+    # the share of each greedy seed's theory genes reshuffled for diversity
+    GREEDY_SEED_RATIO = 0.3
+    GREEDY_PERTURB_RATIO = 0.1
+    
+    MUTATION_TYPES = ('swap_slot', 'change_faculty', 'swap_subjects')
+    
+    # When the best fitness has not improved for this many generations, the
+    # worst share of the population is replaced with fresh greedy seeds
+    STALL_GENERATIONS = 20
+    RESTART_RATIO = 0.2
+    
     def __init__(
         self,
         population_size: int = 100,
@@ -78,7 +326,8 @@ class GeneticAlgorithm:
         crossover_rate: float = 0.8,
         mutation_rate: float = 0.1,
         elite_count: int = 5,
-        tournament_size: int = 5
+        tournament_size: int = 5,
+        seed: Optional[int] = None
     ):
         self.population_size = population_size
         self.generations = generations
@@ -86,6 +335,7 @@ class GeneticAlgorithm:
         self.mutation_rate = mutation_rate
         self.elite_count = elite_count
         self.tournament_size = tournament_size
+        self._rng = np.random.default_rng(seed)
         
         # Data to be loaded
         self.classes = []
@@ -101,6 +351,7 @@ class GeneticAlgorithm:
         # Mapping for quick lookup
         self.class_subjects = defaultdict(list)  # class_id -> list of subject_ids
         self.subject_info = {}  # subject_id -> {type, hours, etc}
+        self._eligible_by_subject = []  # subject index -> eligible faculty indices
         
     def load_data(self, classes, subjects, faculties, time_slots, 
                   faculty_preferences=None, faculty_history=None):
@@ -115,12 +366,28 @@ class GeneticAlgorithm:
         self.theory_subjects = [s for s in subjects if s['subject_type'] == 'THEORY']
         
         # Build subject info map
-        for s in subjects:
+        subjects_by_semester = defaultdict(list)
+        for subject_idx, s in enumerate(subjects):
             self.subject_info[s['id']] = s
-            # Map subjects to their semester's classes
-            for c in classes:
-                if c['semester_id'] == s['semester_id']:
-                    self.class_subjects[c['id']].append(s['id'])
+            subjects_by_semester[s['semester_id']].append(subject_idx)
+        
+        # Map subjects to their semester's classes, stored CSR-style: the
+        # subject indices of class c are _class_subject_idx[indptr[c]:indptr[c + 1]]
+        class_subject_idx = []
+        indptr = [0]
+        for c in classes:
+            semester_subjects = subjects_by_semester.get(c['semester_id'], [])
+            self.class_subjects[c['id']].extend(subjects[i]['id'] for i in semester_subjects)
+            class_subject_idx.extend(semester_subjects)
+            indptr.append(len(class_subject_idx))
+        self._class_subject_idx = np.array(class_subject_idx, dtype=np.int32)
+        self._class_subject_indptr = np.array(indptr, dtype=np.int64)
+        subject_types = [s['subject_type'] for s in subjects]
+        self._subject_is_lab = np.array([t == 'LAB' for t in subject_types], dtype=bool)
+        self._subject_is_theory = np.array([t == 'THEORY' for t in subject_types], dtype=bool)
+        self._subject_hours = np.array(
+            [s.get('hours_per_week', 3) for s in subjects], dtype=np.int16
+        )
         
         # Faculty data
         self.faculty_preferences = faculty_preferences or {}
@@ -128,342 +395,725 @@ class GeneticAlgorithm:
         
         for f in faculties:
             self.faculty_workload_limits[f['id']] = f['max_hours']
+        
+        # Chromosomes store list positions; keep the database ids to decode them
+        self._class_ids = np.array([c['id'] for c in classes], dtype=np.int64)
+        self._subject_ids = np.array([s['id'] for s in subjects], dtype=np.int64)
+        self._faculty_ids = np.array([f['id'] for f in faculties], dtype=np.int64)
+        self._slot_ids = np.array([ts['id'] for ts in time_slots], dtype=np.int64)
+        self._workload_limits = np.array(
+            [self.faculty_workload_limits.get(f['id'], 20) for f in faculties]
+        )
+        
+        # Flat lookup tables for the compiled fitness kernel
+        day_codes = {}
+        self._slot_day = np.array(
+            [day_codes.setdefault(ts['day'], len(day_codes)) for ts in time_slots], dtype=np.int8
+        )
+        self._slot_period = np.array([ts['period'] for ts in time_slots], dtype=np.int8)
+        # Subject codes become small integers so that preferences and history
+        # turn into (faculty, subject) boolean matrices
+        code_index = {}
+        subject_code_idx = np.array(
+            [code_index.setdefault(s.get('code', ''), len(code_index)) for s in subjects],
+            dtype=np.int32
+        )
+        
+        def code_matrix(codes_by_faculty):
+            matrix = np.zeros((len(faculties), len(code_index)), dtype=bool)
+            for faculty_idx, f in enumerate(faculties):
+                codes = [code_index[c] for c in codes_by_faculty.get(f['id'], []) if c in code_index]
+                matrix[faculty_idx, codes] = True
+            return matrix[:, subject_code_idx]
+        
+        self._pref_matrix = code_matrix(self.faculty_preferences)
+        self._history_matrix = code_matrix(self.faculty_history)
+        self._kernel_weights = np.array(
+            [self.WEIGHTS[name] for name in KERNEL_WEIGHTS], dtype=np.float64
+        )
+        
+        # Teaching slots of each day in period order, and the 3 period lab
+        # blocks with their slot bitmaps, shared by every chromosome built
+        slots_by_day = defaultdict(list)
+        for slot_idx, ts in enumerate(time_slots):
+            slots_by_day[ts['day']].append(slot_idx)
+        for day_slots in slots_by_day.values():
+            day_slots.sort(key=lambda i: time_slots[i]['period'])
+        self._slots_by_day = dict(slots_by_day)
+        self._lab_block_masks = []
+        for block in self._lab_blocks():
+            block = np.array(block)
+            block_mask = _slot_bitset(1, len(time_slots))[0]
+            _set_bits(block_mask, block)
+            self._lab_block_masks.append((block, block_mask))
+        
+        # Eligibility only depends on the preferences loaded above, so resolve
+        # it once per subject instead of on every chromosome and mutation
+        self._eligible_by_subject = [
+            self._find_eligible_faculty(subject_idx) for subject_idx in range(len(subjects))
+        ]
     
     def initialize_population(self) -> List[Chromosome]:
-        """Create initial random population"""
+        """Create initial population from greedy seeds topped up with random chromosomes"""
         population = []
         
-        for _ in range(self.population_size):
+        n_greedy = int(self.population_size * self.GREEDY_SEED_RATIO)
+        for _ in range(n_greedy):
+            population.append(self._create_greedy_chromosome())
+        
+        for _ in range(self.population_size - n_greedy):
             chromosome = self._create_random_chromosome()
             population.append(chromosome)
         
         return population
     
+    def _lab_blocks(self) -> List[List[int]]:
+        """All 3 continuous morning or afternoon slot runs, morning runs first"""
+        morning, afternoon = [], []
+        for day_slots in self._slots_by_day.values():
+            for i in range(len(day_slots) - 2):
+                block = day_slots[i:i + 3]
+                periods = [self.time_slots[s]['period'] for s in block]
+                if periods[1] != periods[0] + 1 or periods[2] != periods[1] + 1:
+                    continue
+                if periods[2] <= 3:
+                    morning.append(block)
+                elif periods[0] >= 5:
+                    afternoon.append(block)
+        
+        return morning + afternoon
+    
+    def _create_greedy_chromosome(self) -> Chromosome:
+        """
+        Create a chromosome with few hard-constraint violations.
+        
+        Keeps the layout of a random chromosome and reassigns its slots and
+        faculty: classes with the most genes go first, labs take the first
+        block free for the class and both faculty, and theory subjects go to
+        the least loaded eligible faculty in slots where they are free. A
+        share of theory slots is then reshuffled so seeds stay diverse.
+        """
+        chromosome = self._create_random_chromosome()
+        class_idx = chromosome.class_idx
+        subject_idx = chromosome.subject_idx
+        faculty_idx = chromosome.faculty_idx
+        slot_idx = chromosome.slot_idx
+        assistant_idx = chromosome.assistant_idx
+        
+        n_slots = len(self.time_slots)
+        faculty_busy = _slot_bitset(len(self.faculties), n_slots)
+        faculty_hours = np.zeros(len(self.faculties), dtype=np.int64)
+        lab_blocks = self._lab_block_masks
+        
+        def least_loaded(candidates, block_mask=None):
+            candidates = np.asarray(candidates, dtype=np.int64)
+            if block_mask is not None:
+                candidates = candidates[~(faculty_busy[candidates] & block_mask).any(axis=1)]
+            if not candidates.size:
+                return -1
+            hours = faculty_hours[candidates]
+            return int(self._rng.choice(candidates[hours == hours.min()]))
+        
+        def book(f, slots):
+            if f >= 0:
+                _set_bits(faculty_busy[f], slots)
+                faculty_hours[f] += len(slots)
+        
+        gene_counts = np.bincount(class_idx, minlength=len(self.classes))
+        for c in np.argsort(-gene_counts, kind='stable').tolist():
+            positions = np.flatnonzero(class_idx == c)
+            if not positions.size:
+                continue
+            class_busy = np.zeros(n_slots, dtype=bool)
+            
+            # Labs: each (class, subject) run of lab genes is one session
+            lab_positions = positions[chromosome.is_lab[positions]]
+            for s in dict.fromkeys(subject_idx[lab_positions].tolist()):
+                genes = lab_positions[subject_idx[lab_positions] == s]
+                eligible = self._get_eligible_faculty_for_subject(s)
+                placed = False
+                for block, block_mask in lab_blocks:
+                    if len(block) != len(genes) or class_busy[block].any():
+                        continue
+                    main = least_loaded(eligible, block_mask)
+                    if main < 0:
+                        continue
+                    assistant = -1
+                    if len(eligible) >= 2:
+                        assistant = least_loaded([f for f in eligible if f != main], block_mask)
+                        if assistant < 0:
+                            continue
+                    slot_idx[genes] = block
+                    faculty_idx[genes] = main
+                    assistant_idx[genes] = assistant
+                    placed = True
+                    break
+                if not placed:
+                    # Keep the random placement rather than drop the session
+                    block = slot_idx[genes]
+                    main, assistant = faculty_idx[genes[0]], assistant_idx[genes[0]]
+                class_busy[block] = True
+                book(main, block)
+                book(assistant, block)
+            
+            # Theory: one faculty per subject, slots free for class and faculty
+            theory_positions = positions[~chromosome.is_lab[positions]]
+            for s in dict.fromkeys(subject_idx[theory_positions].tolist()):
+                genes = theory_positions[subject_idx[theory_positions] == s]
+                f = least_loaded(self._get_eligible_faculty_for_subject(s))
+                free = np.flatnonzero(~class_busy)
+                self._rng.shuffle(free)
+                busy = _bits_set(faculty_busy[f], free)
+                slots = np.concatenate([free[~busy], free[busy]])[:len(genes)]
+                slot_idx[genes] = slots
+                faculty_idx[genes] = f
+                class_busy[slots] = True
+                book(f, slots)
+        
+        # Perturb: swap the slots of a few theory genes within their class
+        theory = np.flatnonzero(~chromosome.is_lab)
+        n_perturbed = int(len(theory) * self.GREEDY_PERTURB_RATIO)
+        for i in self._rng.choice(theory, size=n_perturbed, replace=False).tolist():
+            same_class = theory[class_idx[theory] == class_idx[i]]
+            j = int(self._rng.choice(same_class))
+            slot_idx[i], slot_idx[j] = slot_idx[j], slot_idx[i]
+        
+        return chromosome
+    
     def _create_random_chromosome(self) -> Chromosome:
         """Create a single random but valid chromosome"""
-        genes = []
+        columns = {name: [] for name in Chromosome.GENE_FIELDS}
+        
+        def add_gene(class_idx, subject_idx, faculty_idx, slot_idx, is_lab, assistant_idx=-1):
+            columns['class_idx'].append(class_idx)
+            columns['subject_idx'].append(subject_idx)
+            columns['faculty_idx'].append(faculty_idx)
+            columns['slot_idx'].append(slot_idx)
+            columns['is_lab'].append(is_lab)
+            columns['assistant_idx'].append(assistant_idx)
         
-        for class_info in self.classes:
-            class_id = class_info['id']
-            class_subject_ids = self.class_subjects[class_id]
+        all_faculty = list(range(len(self.faculties)))
+        
+        # Slots already taken by each faculty across all classes
+        faculty_busy = _slot_bitset(len(self.faculties), len(self.time_slots))
+        
+        indptr = self._class_subject_indptr
+        for class_idx in range(len(self.classes)):
+            class_subject_idxs = self._class_subject_idx[indptr[class_idx]:indptr[class_idx + 1]]
             
             # Get available time slots
-            available_slots = [ts['id'] for ts in self.time_slots]
+            available_slots = list(range(len(self.time_slots)))
             used_slots = set()
             
             # First, schedule labs (need 3 continuous periods each, 2 per week)
-            lab_subjects_for_class = [
-                s_id for s_id in class_subject_ids 
-                if self.subject_info[s_id]['subject_type'] == 'LAB'
-            ]
+            lab_subjects_for_class = class_subject_idxs[self._subject_is_lab[class_subject_idxs]].tolist()
             
-            for lab_id in lab_subjects_for_class[:2]:  # Max 2 labs per week
+            for lab_idx in lab_subjects_for_class[:2]:  # Max 2 labs per week
                 # Find 3 continuous morning or afternoon slots
                 lab_slots = self._find_lab_slots(available_slots, used_slots)
                 if lab_slots:
                     # Assign main and assistant faculty
-                    eligible_faculty = self._get_eligible_faculty_for_subject(lab_id)
+                    eligible_faculty = self._get_eligible_faculty_for_subject(lab_idx)
                     if len(eligible_faculty) >= 2:
-                        main_faculty = random.choice(eligible_faculty)
-                        assistant_faculty = random.choice([f for f in eligible_faculty if f != main_faculty])
+                        main_faculty, assistant_faculty = self._rng.choice(
+                            eligible_faculty, size=2, replace=False
+                        ).tolist()
                     elif len(eligible_faculty) == 1:
                         main_faculty = eligible_faculty[0]
-                        assistant_faculty = None
+                        assistant_faculty = -1
                     else:
-                        main_faculty = random.choice([f['id'] for f in self.faculties])
-                        assistant_faculty = None
+                        main_faculty = int(self._rng.integers(len(all_faculty)))
+                        assistant_faculty = -1
+                    
+                    for slot_idx in lab_slots:
+                        add_gene(class_idx, lab_idx, main_faculty, slot_idx, True, assistant_faculty)
+                        used_slots.add(slot_idx)
                     
-                    for slot_id in lab_slots:
-                        genes.append(Gene(
-                            class_id=class_id,
-                            subject_id=lab_id,
-                            faculty_id=main_faculty,
-                            time_slot_id=slot_id,
-                            is_lab=True,
-                            assistant_faculty_id=assistant_faculty
-                        ))
-                        used_slots.add(slot_id)
+                    lab_slots = np.array(lab_slots)
+                    _set_bits(faculty_busy[main_faculty], lab_slots)
+                    if assistant_faculty >= 0:
+                        _set_bits(faculty_busy[assistant_faculty], lab_slots)
             
             # Then, schedule theory subjects
-            theory_subjects_for_class = [
-                s_id for s_id in class_subject_ids 
-                if self.subject_info[s_id]['subject_type'] == 'THEORY'
-            ]
+            theory_subjects_for_class = class_subject_idxs[
+                self._subject_is_theory[class_subject_idxs]
+            ].tolist()
             
-            for subject_id in theory_subjects_for_class:
-                hours_needed = self.subject_info[subject_id].get('hours_per_week', 3)
-                eligible_faculty = self._get_eligible_faculty_for_subject(subject_id)
-                
-                if eligible_faculty:
-                    faculty_id = random.choice(eligible_faculty)
-                else:
-                    faculty_id = random.choice([f['id'] for f in self.faculties])
+            # One uniform draw per subject picks its faculty from the eligible list
+            faculty_draws = self._rng.random(len(theory_subjects_for_class)).tolist()
+            
+            for subject_idx, draw in zip(theory_subjects_for_class, faculty_draws):
+                hours_needed = self._subject_hours[subject_idx]
+                eligible_faculty = self._get_eligible_faculty_for_subject(subject_idx) or all_faculty
+                faculty_idx = eligible_faculty[int(draw * len(eligible_faculty))]
                 
-                # Assign hours across the week
-                slots_assigned = 0
-                remaining_slots = [s for s in available_slots if s not in used_slots]
-                random.shuffle(remaining_slots)
+                # Assign hours across the week, preferring slots where the
+                # faculty is not already teaching another class
+                remaining_slots = np.array(
+                    [s for s in available_slots if s not in used_slots], dtype=np.int64
+                )
+                self._rng.shuffle(remaining_slots)
+                busy = _bits_set(faculty_busy[faculty_idx], remaining_slots)
+                chosen = np.concatenate([remaining_slots[~busy], remaining_slots[busy]])[:int(hours_needed)]
                 
-                for slot_id in remaining_slots:
-                    if slots_assigned >= hours_needed:
-                        break
-                    genes.append(Gene(
-                        class_id=class_id,
-                        subject_id=subject_id,
-                        faculty_id=faculty_id,
-                        time_slot_id=slot_id,
-                        is_lab=False
-                    ))
-                    used_slots.add(slot_id)
-                    slots_assigned += 1
-        
-        return Chromosome(genes=genes)
+                for slot_idx in chosen.tolist():
+                    add_gene(class_idx, subject_idx, faculty_idx, slot_idx, False)
+                    used_slots.add(slot_idx)
+                _set_bits(faculty_busy[faculty_idx], chosen)
+        
+        return Chromosome(
+            class_idx=np.array(columns['class_idx'], dtype=np.int32),
+            subject_idx=np.array(columns['subject_idx'], dtype=np.int32),
+            faculty_idx=np.array(columns['faculty_idx'], dtype=np.int32),
+            slot_idx=np.array(columns['slot_idx'], dtype=np.int32),
+            is_lab=np.array(columns['is_lab'], dtype=bool),
+            assistant_idx=np.array(columns['assistant_idx'], dtype=np.int32),
+        )
     
     def _find_lab_slots(self, available_slots: List[int], used_slots: set) -> List[int]:
         """Find 3 continuous periods for a lab session"""
-        # Group slots by day
-        slots_by_day = defaultdict(list)
-        for slot in self.time_slots:
-            if slot['id'] in available_slots and slot['id'] not in used_slots:
-                slots_by_day[slot['day']].append(slot)
+        # Group free slots by day, keeping the period order built by load_data
+        available = set(available_slots).difference(used_slots)
+        slots_by_day = {
+            day: [s for s in day_slots if s in available]
+            for day, day_slots in self._slots_by_day.items()
+        }
+        
+        period_of = lambda i: self.time_slots[i]['period']
         
         # Look for 3 continuous morning (1-3) or afternoon (5-7) slots
         for day, day_slots in slots_by_day.items():
-            day_slots.sort(key=lambda x: x['period'])
-            
             # Try morning slots (periods 1, 2, 3)
-            morning_slots = [s for s in day_slots if s['period'] <= 3]
+            morning_slots = [s for s in day_slots if period_of(s) <= 3]
             if len(morning_slots) >= 3:
-                periods = [s['period'] for s in morning_slots]
+                periods = [period_of(s) for s in morning_slots]
                 if 1 in periods and 2 in periods and 3 in periods:
-                    return [s['id'] for s in morning_slots if s['period'] <= 3][:3]
+                    return morning_slots[:3]
             
             # Try afternoon slots (periods 5, 6, 7)
-            afternoon_slots = [s for s in day_slots if s['period'] >= 5]
+            afternoon_slots = [s for s in day_slots if period_of(s) >= 5]
             if len(afternoon_slots) >= 3:
-                periods = [s['period'] for s in afternoon_slots]
+                periods = [period_of(s) for s in afternoon_slots]
                 if 5 in periods and 6 in periods and 7 in periods:
-                    return [s['id'] for s in afternoon_slots if s['period'] >= 5][:3]
+                    return afternoon_slots[:3]
         
         # Fallback: return any 3 continuous slots
         for day, day_slots in slots_by_day.items():
             if len(day_slots) >= 3:
-                day_slots.sort(key=lambda x: x['period'])
                 for i in range(len(day_slots) - 2):
-                    if day_slots[i+1]['period'] == day_slots[i]['period'] + 1 and \
-                       day_slots[i+2]['period'] == day_slots[i]['period'] + 2:
-                        return [day_slots[i]['id'], day_slots[i+1]['id'], day_slots[i+2]['id']]
+                    if period_of(day_slots[i+1]) == period_of(day_slots[i]) + 1 and \
+                       period_of(day_slots[i+2]) == period_of(day_slots[i]) + 2:
+                        return [day_slots[i], day_slots[i+1], day_slots[i+2]]
         
         return []
     
-    def _get_eligible_faculty_for_subject(self, subject_id: int) -> List[int]:
-        """Get faculty IDs who can teach a subject based on preferences and capacity"""
-        subject = self.subject_info.get(subject_id, {})
+    def _get_eligible_faculty_for_subject(self, subject_idx: int) -> List[int]:
+        """Get faculty indices who can teach a subject (cached by load_data, do not modify)"""
+        return self._eligible_by_subject[subject_idx]
+    
+    def _find_eligible_faculty(self, subject_idx: int) -> List[int]:
+        """Get faculty indices who can teach a subject based on preferences and capacity"""
+        subject_code = self.subjects[subject_idx].get('code', '')
         eligible = []
         
-        for faculty in self.faculties:
+        for faculty_idx, faculty in enumerate(self.faculties):
             # Check if faculty prefers this subject
             preferences = self.faculty_preferences.get(faculty['id'], [])
-            subject_code = subject.get('code', '')
             
             if subject_code in preferences or not preferences:
-                eligible.append(faculty['id'])
+                eligible.append(faculty_idx)
         
-        return eligible if eligible else [f['id'] for f in self.faculties]
+        return eligible if eligible else list(range(len(self.faculties)))
     
-    def calculate_fitness(self, chromosome: Chromosome) -> float:
-        """Calculate fitness score for a chromosome"""
+    def calculate_fitness(self, chromosome: Chromosome, cutoff: Optional[float] = None) -> float:
+        """
+        Calculate fitness score for a chromosome
+        
+        With a cutoff, scoring stops as soon as the result is certain to be
+        below it. The partial score stored then is still below the cutoff,
+        but it is not the exact fitness.
+        """
+        if cutoff is None:
+            cutoff = -np.inf
+        
+        if _compiled_fitness_kernel is not None:
+            chromosome.fitness = _compiled_fitness_kernel(
+                chromosome.class_idx, chromosome.subject_idx, chromosome.faculty_idx,
+                chromosome.slot_idx, chromosome.is_lab, chromosome.assistant_idx,
+                len(self.classes), len(self.subjects), len(self.faculties), len(self.time_slots),
+                self._slot_day, self._slot_period, self._pref_matrix, self._history_matrix,
+                self._workload_limits, self._kernel_weights, float(cutoff)
+            )
+            return chromosome.fitness
+        
         fitness = 0.0
         
-        # Track violations
-        faculty_schedule = defaultdict(set)  # faculty_id -> set of time_slot_ids
-        class_schedule = defaultdict(set)    # class_id -> set of time_slot_ids
-        faculty_hours = defaultdict(int)      # faculty_id -> total hours
-        class_labs = defaultdict(list)        # class_id -> list of lab genes
-        
-        for gene in chromosome.genes:
-            # Check faculty clash
-            if gene.time_slot_id in faculty_schedule[gene.faculty_id]:
-                fitness += self.WEIGHTS['faculty_clash']
-            faculty_schedule[gene.faculty_id].add(gene.time_slot_id)
-            
-            # Check assistant faculty clash too
-            if gene.assistant_faculty_id:
-                if gene.time_slot_id in faculty_schedule[gene.assistant_faculty_id]:
-                    fitness += self.WEIGHTS['faculty_clash']
-                faculty_schedule[gene.assistant_faculty_id].add(gene.time_slot_id)
-            
-            # Check class clash
-            if gene.time_slot_id in class_schedule[gene.class_id]:
-                fitness += self.WEIGHTS['class_clash']
-            class_schedule[gene.class_id].add(gene.time_slot_id)
-            
-            # Track faculty hours
-            faculty_hours[gene.faculty_id] += 1
-            if gene.assistant_faculty_id:
-                faculty_hours[gene.assistant_faculty_id] += 1
+        slot_idx = chromosome.slot_idx
+        faculty_idx = chromosome.faculty_idx
+        has_assistant = chromosome.assistant_idx >= 0
+        assistant_idx = chromosome.assistant_idx[has_assistant]
+        
+        # Faculty preference bonus and subject rotation penalty. The bonus is
+        # the only reward, so once it is counted every later term can only
+        # lower the score and the cutoff can be checked between stages
+        fitness += self.WEIGHTS['faculty_preference'] * int(
+            np.count_nonzero(self._pref_matrix[faculty_idx, chromosome.subject_idx])
+        )
+        fitness += self.WEIGHTS['subject_rotation'] * int(
+            np.count_nonzero(self._history_matrix[faculty_idx, chromosome.subject_idx])
+        )
+        
+        # Clashes are counted on composite (owner, slot) keys: every bucket
+        # holding more than one gene is a double booking
+        n_slots = len(self.time_slots)
+        
+        # Faculty clash, counting assistant faculty alongside main faculty
+        faculty_keys = np.concatenate([
+            faculty_idx * n_slots + slot_idx,
+            assistant_idx * n_slots + slot_idx[has_assistant],
+        ])
+        fitness += self.WEIGHTS['faculty_clash'] * _count_repeats(faculty_keys)
+        if fitness < cutoff:
+            chromosome.fitness = fitness
+            return fitness
+        
+        # Class clash
+        class_keys = chromosome.class_idx * n_slots + slot_idx
+        fitness += self.WEIGHTS['class_clash'] * _count_repeats(class_keys)
+        if fitness < cutoff:
+            chromosome.fitness = fitness
+            return fitness
+        
+        # Faculty hours (main + assistant)
+        n_faculty = len(self.faculties)
+        faculty_hours = (
+            np.bincount(faculty_idx, minlength=n_faculty) +
+            np.bincount(assistant_idx, minlength=n_faculty)
+        )
+        
+        # Check workload limits
+        excess = np.maximum(faculty_hours - self._workload_limits, 0)
+        fitness += self.WEIGHTS['workload_exceeded'] * int(excess.sum())
+        if fitness < cutoff:
+            chromosome.fitness = fitness
+            return fitness
+        
+        # Check lab constraints per (class, lab subject) group: one lexsort
+        # puts each group's lab slots in a contiguous run
+        lab_mask = chromosome.is_lab
+        lab_class = chromosome.class_idx[lab_mask]
+        lab_subject = chromosome.subject_idx[lab_mask]
+        order = np.lexsort((lab_subject, lab_class))
+        lab_slots = slot_idx[lab_mask][order]
+        new_group = (np.diff(lab_class[order]) != 0) | (np.diff(lab_subject[order]) != 0)
+        bounds = np.r_[0, np.flatnonzero(new_group) + 1, len(order)].tolist() if len(order) else []
+        
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            slot_ids = lab_slots[start:end]
             
-            # Track labs
-            if gene.is_lab:
-                class_labs[gene.class_id].append(gene)
+            # Check lab continuity
+            if not self._check_lab_continuity(slot_ids):
+                fitness += self.WEIGHTS['lab_continuity']
             
-            # Check faculty preference
-            preferences = self.faculty_preferences.get(gene.faculty_id, [])
-            subject_code = self.subject_info.get(gene.subject_id, {}).get('code', '')
-            if subject_code in preferences:
-                fitness += self.WEIGHTS['faculty_preference']
+            # Check lab timing (should be all morning or all afternoon)
+            if not self._check_lab_timing(slot_ids):
+                fitness += self.WEIGHTS['lab_timing']
+        
+        # Check workload balance (soft constraint)
+        busy_hours = faculty_hours[faculty_hours > 0]
+        if busy_hours.size:
+            deviation = np.abs(busy_hours - busy_hours.mean())
+            fitness += self.WEIGHTS['workload_balance'] * float(np.maximum(deviation - 5, 0).sum())
+        
+        chromosome.fitness = fitness
+        return fitness
+    
+    def calculate_population_fitness(self, chromosomes: List[Chromosome]) -> np.ndarray:
+        """
+        Score a batch of chromosomes with one set of array operations.
+        
+        All chromosomes share one gene layout, so their columns stack into
+        (population, genes) matrices. Per-chromosome counts come from a single
+        bincount over keys offset by row. Fitness is stored on each chromosome
+        and also returned as an array.
+        """
+        n_pop = len(chromosomes)
+        n_slots = len(self.time_slots)
+        n_faculty = len(self.faculties)
+        weights = self.WEIGHTS
+        
+        class_idx = np.stack([c.class_idx for c in chromosomes]).astype(np.int64)
+        faculty_idx = np.stack([c.faculty_idx for c in chromosomes]).astype(np.int64)
+        slot_idx = np.stack([c.slot_idx for c in chromosomes]).astype(np.int64)
+        assistant_idx = np.stack([c.assistant_idx for c in chromosomes]).astype(np.int64)
+        has_assistant = assistant_idx >= 0
+        rows = np.broadcast_to(np.arange(n_pop)[:, None], slot_idx.shape)
+        
+        def repeats_per_row(keys, key_rows, n_keys):
+            counts = np.bincount(key_rows * n_keys + keys, minlength=n_pop * n_keys)
+            occupied = np.count_nonzero(counts.reshape(n_pop, n_keys), axis=1)
+            return np.bincount(key_rows, minlength=n_pop) - occupied
+        
+        # Faculty clash, counting assistant faculty alongside main faculty
+        faculty_keys = np.concatenate([
+            (faculty_idx * n_slots + slot_idx).ravel(),
+            assistant_idx[has_assistant] * n_slots + slot_idx[has_assistant],
+        ])
+        key_rows = np.concatenate([rows.ravel(), rows[has_assistant]])
+        fitness = weights['faculty_clash'] * repeats_per_row(faculty_keys, key_rows, n_faculty * n_slots)
+        
+        # Class clash
+        class_keys = class_idx * n_slots + slot_idx
+        fitness = fitness + weights['class_clash'] * repeats_per_row(
+            class_keys.ravel(), rows.ravel(), len(self.classes) * n_slots
+        )
+        
+        # Faculty hours (main + assistant)
+        faculty_hours = (
+            np.bincount((rows * n_faculty + faculty_idx).ravel(), minlength=n_pop * n_faculty) +
+            np.bincount(rows[has_assistant] * n_faculty + assistant_idx[has_assistant],
+                        minlength=n_pop * n_faculty)
+        ).reshape(n_pop, n_faculty)
         
         # Check workload limits
-        for faculty_id, hours in faculty_hours.items():
-            max_hours = self.faculty_workload_limits.get(faculty_id, 20)
-            if hours > max_hours:
-                fitness += self.WEIGHTS['workload_exceeded'] * (hours - max_hours)
-        
-        # Check lab constraints
-        for class_id, lab_genes in class_labs.items():
-            # Group by subject to check for 2 lab sessions
-            lab_subjects_scheduled = set(g.subject_id for g in lab_genes)
+        excess = np.maximum(faculty_hours - self._workload_limits, 0)
+        fitness = fitness + weights['workload_exceeded'] * excess.sum(axis=1)
+        
+        # Lab groups sit at the same positions in every chromosome
+        layout = chromosomes[0]
+        lab_positions = np.flatnonzero(layout.is_lab)
+        if lab_positions.size:
+            group_keys = (
+                layout.class_idx[lab_positions].astype(np.int64) * len(self.subjects) +
+                layout.subject_idx[lab_positions]
+            )
+            order = np.argsort(group_keys, kind='stable')
+            lab_positions = lab_positions[order]
+            group_keys = group_keys[order]
+            starts = np.flatnonzero(np.r_[True, group_keys[1:] != group_keys[:-1]])
+            sizes = np.diff(np.r_[starts, len(group_keys)])
             
-            for lab_subject_id in lab_subjects_scheduled:
-                subject_lab_genes = [g for g in lab_genes if g.subject_id == lab_subject_id]
-                
-                # Check lab continuity
-                slot_ids = [g.time_slot_id for g in subject_lab_genes]
-                if not self._check_lab_continuity(slot_ids):
-                    fitness += self.WEIGHTS['lab_continuity']
-                
-                # Check lab timing (should be all morning or all afternoon)
-                if not self._check_lab_timing(slot_ids):
-                    fitness += self.WEIGHTS['lab_timing']
+            # Check lab timing (should be all morning or all afternoon)
+            periods = self._slot_period[slot_idx[:, lab_positions]]
+            morning = np.logical_and.reduceat(periods <= 3, starts, axis=1)
+            afternoon = np.logical_and.reduceat(periods >= 5, starts, axis=1)
+            timing_failures = np.count_nonzero(~(morning | afternoon), axis=1)
+            
+            # Check lab continuity: 3 periods on one day, each following the last
+            triples = lab_positions[starts[sizes == 3][:, None] + np.arange(3)]
+            triple_slots = slot_idx[:, triples]
+            days = self._slot_day[triple_slots]
+            triple_periods = np.sort(self._slot_period[triple_slots], axis=2).astype(np.int64)
+            continuous = (
+                (days[..., 0] == days[..., 1]) & (days[..., 1] == days[..., 2]) &
+                (triple_periods[..., 1] == triple_periods[..., 0] + 1) &
+                (triple_periods[..., 2] == triple_periods[..., 1] + 1)
+            )
+            continuity_failures = len(starts) - np.count_nonzero(continuous, axis=1)
+            
+            fitness = fitness + weights['lab_continuity'] * continuity_failures
+            fitness = fitness + weights['lab_timing'] * timing_failures
         
         # Check workload balance (soft constraint)
-        if faculty_hours:
-            avg_hours = sum(faculty_hours.values()) / len(faculty_hours)
-            for hours in faculty_hours.values():
-                deviation = abs(hours - avg_hours)
-                if deviation > 5:
-                    fitness += self.WEIGHTS['workload_balance'] * (deviation - 5)
+        busy = faculty_hours > 0
+        n_busy = busy.sum(axis=1)
+        mean_hours = np.divide(
+            (faculty_hours * busy).sum(axis=1), n_busy,
+            out=np.zeros(n_pop), where=n_busy > 0
+        )
+        deviation = np.abs(faculty_hours - mean_hours[:, None])
+        imbalance = (np.maximum(deviation - 5, 0) * busy).sum(axis=1)
+        fitness = fitness + weights['workload_balance'] * imbalance
         
-        # Subject rotation penalty
-        for gene in chromosome.genes:
-            history = self.faculty_history.get(gene.faculty_id, [])
-            subject_code = self.subject_info.get(gene.subject_id, {}).get('code', '')
-            if subject_code in history:
-                fitness += self.WEIGHTS['subject_rotation']
+        # Faculty preference bonus and subject rotation penalty
+        subject_idx = layout.subject_idx[None, :]
+        fitness = fitness + weights['faculty_preference'] * np.count_nonzero(
+            self._pref_matrix[faculty_idx, subject_idx], axis=1
+        )
+        fitness = fitness + weights['subject_rotation'] * np.count_nonzero(
+            self._history_matrix[faculty_idx, subject_idx], axis=1
+        )
         
-        chromosome.fitness = fitness
+        fitness = fitness.astype(np.float64)
+        for chromosome, value in zip(chromosomes, fitness.tolist()):
+            chromosome.fitness = value
         return fitness
     
-    def _check_lab_continuity(self, slot_ids: List[int]) -> bool:
+    def _check_lab_continuity(self, slot_ids: np.ndarray) -> bool:
         """Check if lab slots are 3 continuous periods"""
         if len(slot_ids) != 3:
             return False
         
-        slots = [ts for ts in self.time_slots if ts['id'] in slot_ids]
+        slots = np.unique(slot_ids)
         if len(slots) != 3:
             return False
         
         # All same day
-        days = set(s['day'] for s in slots)
-        if len(days) != 1:
+        days = self._slot_day[slots]
+        if days[0] != days[1] or days[1] != days[2]:
             return False
         
         # Continuous periods
-        periods = sorted(s['period'] for s in slots)
+        periods = np.sort(self._slot_period[slots])
         return periods[1] == periods[0] + 1 and periods[2] == periods[1] + 1
     
-    def _check_lab_timing(self, slot_ids: List[int]) -> bool:
+    def _check_lab_timing(self, slot_ids: np.ndarray) -> bool:
         """Check if all lab slots are in morning or all in afternoon"""
-        slots = [ts for ts in self.time_slots if ts['id'] in slot_ids]
+        periods = self._slot_period[slot_ids]
         
         # Check if all morning (periods 1-3) or all afternoon (periods 5-7)
-        all_morning = all(s['period'] <= 3 for s in slots)
-        all_afternoon = all(s['period'] >= 5 for s in slots)
-        
-        return all_morning or all_afternoon
+        return bool((periods <= 3).all() or (periods >= 5).all())
     
-    def tournament_selection(self, population: List[Chromosome]) -> Chromosome:
-        """Select a chromosome using tournament selection"""
-        tournament = random.sample(population, min(self.tournament_size, len(population)))
-        return max(tournament, key=lambda c: c.fitness)
+    def tournament_selection(self, fitness: np.ndarray, count: int) -> np.ndarray:
+        """
+        Run `count` tournaments at once and return the population index of
+        each winner. All contestants are drawn in a single call, one row per
+        tournament.
+        """
+        contestants = self._rng.integers(0, len(fitness), size=(count, self.tournament_size))
+        best = fitness[contestants].argmax(axis=1)
+        return contestants[np.arange(count), best]
     
     def crossover(self, parent1: Chromosome, parent2: Chromosome) -> Tuple[Chromosome, Chromosome]:
-        """Partially Mapped Crossover (PMX) for timetables"""
-        if random.random() > self.crossover_rate:
+        """Class-wise crossover: children swap the genes of a random half of the classes"""
+        if self._rng.random() > self.crossover_rate:
             return parent1.copy(), parent2.copy()
         
-        child1 = parent1.copy()
-        child2 = parent2.copy()
-        
-        # Group genes by class for structured crossover
-        p1_by_class = defaultdict(list)
-        p2_by_class = defaultdict(list)
-        
-        for gene in parent1.genes:
-            p1_by_class[gene.class_id].append(gene)
-        for gene in parent2.genes:
-            p2_by_class[gene.class_id].append(gene)
+        # Swap genes for random half of the classes. Both parents share the
+        # same gene layout, so one positional mask covers either of them
+        n_classes = len(self.classes)
+        swap_class = np.zeros(n_classes, dtype=bool)
+        swap_class[self._rng.choice(n_classes, size=n_classes // 2, replace=False)] = True
+        swap = swap_class[parent1.class_idx]
         
-        # Swap genes for random half of the classes
-        all_classes = list(set(p1_by_class.keys()) | set(p2_by_class.keys()))
-        classes_to_swap = random.sample(all_classes, len(all_classes) // 2)
-        
-        child1_genes = []
-        child2_genes = []
-        
-        for class_id in all_classes:
-            if class_id in classes_to_swap:
-                child1_genes.extend([Gene(**g.__dict__) for g in p2_by_class.get(class_id, [])])
-                child2_genes.extend([Gene(**g.__dict__) for g in p1_by_class.get(class_id, [])])
-            else:
-                child1_genes.extend([Gene(**g.__dict__) for g in p1_by_class.get(class_id, [])])
-                child2_genes.extend([Gene(**g.__dict__) for g in p2_by_class.get(class_id, [])])
-        
-        child1.genes = child1_genes
-        child2.genes = child2_genes
+        child1 = Chromosome.blend(parent1, parent2, swap)
+        child2 = Chromosome.blend(parent2, parent1, swap)
         
         return child1, child2
     
-    def mutate(self, chromosome: Chromosome) -> Chromosome:
-        """Apply mutation operators"""
-        if random.random() > self.mutation_rate:
+    def mutate(self, chromosome: Chromosome, in_place: bool = False) -> Chromosome:
+        """
+        Apply mutation operators
+        
+        Pass in_place=True for chromosomes nothing else refers to, such as
+        fresh crossover children, to skip the defensive copy.
+        """
+        if self._rng.random() > self.mutation_rate:
             return chromosome
         
-        mutated = chromosome.copy()
+        mutated = chromosome if in_place else chromosome.copy()
+        mutated.dirty = True
         
         # Choose mutation type
-        mutation_type = random.choice(['swap_slot', 'change_faculty', 'swap_subjects'])
+        mutation_type = self.MUTATION_TYPES[self._rng.integers(len(self.MUTATION_TYPES))]
         
-        if not mutated.genes:
+        if not len(mutated):
             return mutated
         
+        i = int(self._rng.integers(len(mutated)))
+        
         if mutation_type == 'swap_slot':
             # Swap time slots between two genes of the same class
-            gene1 = random.choice(mutated.genes)
-            same_class_genes = [g for g in mutated.genes 
-                               if g.class_id == gene1.class_id and g != gene1 and not g.is_lab]
-            if same_class_genes:
-                gene2 = random.choice(same_class_genes)
-                gene1.time_slot_id, gene2.time_slot_id = gene2.time_slot_id, gene1.time_slot_id
+            same_class = (mutated.class_idx == mutated.class_idx[i]) & ~mutated.is_lab
+            same_class[i] = False
+            candidates = np.flatnonzero(same_class)
+            if candidates.size:
+                j = int(self._rng.choice(candidates))
+                mutated.slot_idx[i], mutated.slot_idx[j] = mutated.slot_idx[j], mutated.slot_idx[i]
         
         elif mutation_type == 'change_faculty':
             # Change faculty for a random gene
-            gene = random.choice(mutated.genes)
-            eligible = self._get_eligible_faculty_for_subject(gene.subject_id)
+            eligible = self._get_eligible_faculty_for_subject(int(mutated.subject_idx[i]))
             if eligible:
-                gene.faculty_id = random.choice(eligible)
+                mutated.faculty_idx[i] = self._rng.choice(eligible)
         
         elif mutation_type == 'swap_subjects':
-            # Swap subjects in the same time slot (different classes)
-            gene1 = random.choice(mutated.genes)
-            same_slot_genes = [g for g in mutated.genes 
-                              if g.time_slot_id == gene1.time_slot_id and g.class_id != gene1.class_id]
-            if same_slot_genes:
-                gene2 = random.choice(same_slot_genes)
-                gene1.faculty_id, gene2.faculty_id = gene2.faculty_id, gene1.faculty_id
+            # Swap faculty between genes in the same time slot (different classes)
+            candidates = np.flatnonzero(
+                (mutated.slot_idx == mutated.slot_idx[i]) & (mutated.class_idx != mutated.class_idx[i])
+            )
+            if candidates.size:
+                j = int(self._rng.choice(candidates))
+                mutated.faculty_idx[i], mutated.faculty_idx[j] = mutated.faculty_idx[j], mutated.faculty_idx[i]
         
         return mutated
     
+    def decode(self, chromosome: Chromosome) -> List[Gene]:
+        """Translate a chromosome back into genes keyed by database ids"""
+        has_assistant = chromosome.assistant_idx >= 0
+        assistant_ids = np.where(
+            has_assistant,
+            self._faculty_ids[np.maximum(chromosome.assistant_idx, 0)],
+            0
+        )
+        return [
+            Gene(
+                class_id=class_id,
+                subject_id=subject_id,
+                faculty_id=faculty_id,
+                time_slot_id=slot_id,
+                is_lab=is_lab,
+                assistant_faculty_id=assistant_id if assisted else None
+            )
+            for class_id, subject_id, faculty_id, slot_id, is_lab, assistant_id, assisted in zip(
+                self._class_ids[chromosome.class_idx].tolist(),
+                self._subject_ids[chromosome.subject_idx].tolist(),
+                self._faculty_ids[chromosome.faculty_idx].tolist(),
+                self._slot_ids[chromosome.slot_idx].tolist(),
+                chromosome.is_lab.tolist(),
+                assistant_ids.tolist(),
+                has_assistant.tolist(),
+            )
+        ]
+    
+    def evaluate_population(self, chromosomes: List[Chromosome], cutoff: Optional[float] = None):
+        """
+        Calculate fitness for the chromosomes of a batch whose genes changed
+        
+        cutoff is passed on to the compiled kernel, which stops early like
+        calculate_fitness; the NumPy batch path always scores in full.
+        """
+        pending = [c for c in chromosomes if c.dirty]
+        if pending:
+            self._evaluate_batch(pending, cutoff)
+        for chromosome in pending:
+            chromosome.dirty = False
+    
+    def _evaluate_batch(self, chromosomes: List[Chromosome], cutoff: Optional[float]):
+        """Score a batch of chromosomes; the compiled kernel runs them in parallel threads"""
+        if _compiled_population_kernel is None:
+            # Without the compiled kernel, whole-batch array operations
+            # beat scoring chromosomes one by one
+            self.calculate_population_fitness(chromosomes)
+            return
+        
+        # All chromosomes share one layout; only the varying columns are stacked
+        layout = chromosomes[0]
+        fitness = _compiled_population_kernel(
+            layout.class_idx, layout.subject_idx,
+            np.stack([c.faculty_idx for c in chromosomes]),
+            np.stack([c.slot_idx for c in chromosomes]),
+            layout.is_lab,
+            np.stack([c.assistant_idx for c in chromosomes]),
+            len(self.classes), len(self.subjects), len(self.faculties), len(self.time_slots),
+            self._slot_day, self._slot_period, self._pref_matrix, self._history_matrix,
+            self._workload_limits, self._kernel_weights,
+            -np.inf if cutoff is None else float(cutoff)
+        )
+        for chromosome, value in zip(chromosomes, fitness.tolist()):
+            chromosome.fitness = value
+    
+    def _restart_worst(self, population: List[Chromosome]):
+        """Replace the worst chromosomes of a sorted population with scored greedy seeds"""
+        n_restart = int(len(population) * self.RESTART_RATIO)
+        if not n_restart:
+            return
+        
+        fresh = [self._create_greedy_chromosome() for _ in range(n_restart)]
+        self.evaluate_population(fresh)
+        population[-n_restart:] = fresh
+        population.sort(key=lambda c: c.fitness, reverse=True)
+    
     def evolve(self, callback=None) -> Tuple[Chromosome, List[float]]:
         """
         Main GA loop
@@ -478,11 +1128,11 @@ class GeneticAlgorithm:
         population = self.initialize_population()
         
         # Evaluate initial fitness
-        for chromosome in population:
-            self.calculate_fitness(chromosome)
+        self.evaluate_population(population)
         
         fitness_history = []
         best_ever = max(population, key=lambda c: c.fitness)
+        last_restart = 0
         
         for generation in range(self.generations):
             # Sort by fitness
@@ -491,7 +1141,7 @@ class GeneticAlgorithm:
             # Track best
             current_best = population[0]
             if current_best.fitness > best_ever.fitness:
-                best_ever = current_best.copy()
+                best_ever = current_best
             
             fitness_history.append(current_best.fitness)
             
@@ -502,35 +1152,164 @@ class GeneticAlgorithm:
             if current_best.fitness >= 0:
                 break
             
+            # Inject fresh chromosomes when the search has stalled, at most
+            # once per stall window
+            window = self.STALL_GENERATIONS
+            if (generation - last_restart >= window and len(fitness_history) > window and
+                    fitness_history[-1] <= fitness_history[-1 - window]):
+                self._restart_worst(population)
+                last_restart = generation
+            
             # Create new population
             new_population = []
             
-            # Elitism - keep best chromosomes
-            for i in range(self.elite_count):
-                new_population.append(population[i].copy())
+            # Elitism - keep best chromosomes; operators copy before writing,
+            # so elites can be carried over by reference
+            new_population.extend(population[:self.elite_count])
             
             # Generate rest through selection, crossover, mutation
-            while len(new_population) < self.population_size:
-                parent1 = self.tournament_selection(population)
-                parent2 = self.tournament_selection(population)
-                
-                child1, child2 = self.crossover(parent1, parent2)
-                
-                child1 = self.mutate(child1)
-                child2 = self.mutate(child2)
+            children = []
+            n_children = self.population_size - len(new_population)
+            n_pairs = (n_children + 1) // 2
+            fitness = np.array([c.fitness for c in population])
+            parents = self.tournament_selection(fitness, 2 * n_pairs).reshape(n_pairs, 2)
+            for i, j in parents.tolist():
+                child1, child2 = self.crossover(population[i], population[j])
                 
-                self.calculate_fitness(child1)
-                self.calculate_fitness(child2)
-                
-                new_population.append(child1)
-                if len(new_population) < self.population_size:
-                    new_population.append(child2)
+                # Crossover always returns new chromosomes, so mutate them in place
+                children.append(self.mutate(child1, in_place=True))
+                if len(children) < n_children:
+                    children.append(self.mutate(child2, in_place=True))
+            
+            # Children are independent, so score them as one batch. Every
+            # child can be picked as a parent next generation, so each needs
+            # its exact fitness; no cutoff
+            self.evaluate_population(children)
             
-            population = new_population
+            population = new_population + children
         
         return best_ever, fitness_history
 
 
+# Subject.hours_per_week is a property; this computes the same total in SQL
+SUBJECT_WEEKLY_HOURS = F('lecture_hours') + F('tutorial_hours') + F('practical_hours')
+
+
+def _delete_timetable_entries(semester_ids, semester_instance: str) -> int:
+    """
+    Remove the entries of a semester instance for the given semesters with a
+    single DELETE.
+    
+    Nothing references TimetableEntry, so the ORM collector's SELECT and
+    per-row post_delete signals are pure overhead here; the workload counters
+    are recounted by _save_timetable_entries afterwards.
+    """
+    from core.models import ClassSection, TimetableEntry
+    
+    semester_ids = list(semester_ids)
+    if not semester_ids:
+        return 0
+    
+    qn = connection.ops.quote_name
+    placeholders = ', '.join(['%s'] * len(semester_ids))
+    sql = (
+        f'DELETE FROM {qn(TimetableEntry._meta.db_table)} '
+        f'WHERE {qn("semester_instance")} = %s AND {qn("class_section_id")} IN ('
+        f'SELECT {qn("id")} FROM {qn(ClassSection._meta.db_table)} '
+        f'WHERE {qn("semester_id")} IN ({placeholders}))'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [semester_instance, *semester_ids])
+        return cursor.rowcount
+
+
+def _save_timetable_entries(genes: List[Gene], semester_instance: str) -> list:
+    """
+    Persist decoded genes as timetable entries with bulk inserts, and record
+    the faculty-subject assignments they imply that do not exist yet.
+    
+    Returns the created TimetableEntry objects.
+    """
+    from core.models import Faculty, FacultySubjectAssignment, TimetableEntry
+    
+    entries = TimetableEntry.objects.bulk_create([
+        TimetableEntry(
+            class_section_id=gene.class_id,
+            subject_id=gene.subject_id,
+            faculty_id=gene.faculty_id,
+            time_slot_id=gene.time_slot_id,
+            semester_instance=semester_instance,
+            is_lab_session=gene.is_lab,
+            assistant_faculty_id=gene.assistant_faculty_id
+        )
+        for gene in genes
+    ], batch_size=500)
+    
+    # (faculty, subject, class) -> is_main, keeping the first role seen
+    wanted = {}
+    for gene in genes:
+        wanted.setdefault((gene.faculty_id, gene.subject_id, gene.class_id), True)
+        if gene.assistant_faculty_id:
+            wanted.setdefault((gene.assistant_faculty_id, gene.subject_id, gene.class_id), False)
+    
+    # Rows that already exist hit the unique constraint and are skipped
+    FacultySubjectAssignment.objects.bulk_create([
+        FacultySubjectAssignment(
+            faculty_id=faculty_id,
+            subject_id=subject_id,
+            semester_instance=semester_instance,
+            class_section_id=class_id,
+            is_main=is_main
+        )
+        for (faculty_id, subject_id, class_id), is_main in wanted.items()
+    ], ignore_conflicts=True, batch_size=500)
+    
+    # Neither bulk_create nor the raw cleanup DELETE sends signals, so recount
+    # every faculty member's workload in one statement
+    Faculty.recalculate_workload()
+    TimetableEntry.clear_grid_cache()
+    
+    return entries
+
+
+# Teaching slots the generator expects: 7 periods × 5 days
+EXPECTED_TEACHING_SLOTS = 7 * 5
+
+
+@lru_cache(maxsize=1)
+def _get_teaching_slots() -> tuple:
+    """
+    Teaching (non-lunch) slots as (id, day, period) triples.
+    
+    Slots only change when they are re-initialized, so the rows are read once
+    per process; TimeSlot save/delete signals clear the cache.
+    """
+    from core.models import TimeSlot
+    
+    return tuple(TimeSlot.objects.filter(
+        slot_type__in=['MORNING', 'AFTERNOON']
+    ).values_list('id', 'day', 'period'))
+
+
+def _load_teaching_slots() -> Tuple[list, Optional[str]]:
+    """Return the teaching slots as GA dicts, or an error message if unusable"""
+    time_slots = [
+        {'id': slot_id, 'day': day, 'period': period}
+        for slot_id, day, period in _get_teaching_slots()
+    ]
+    
+    if not time_slots:
+        return time_slots, 'No time slots configured. Please initialize time slots first.'
+    
+    # Verify we have the expected number of teaching slots
+    if len(time_slots) != EXPECTED_TEACHING_SLOTS:
+        return time_slots, (
+            f'Invalid time slot configuration. Expected {EXPECTED_TEACHING_SLOTS} teaching slots, '
+            f'found {len(time_slots)}. Please re-initialize time slots.'
+        )
+    return time_slots, None
+
+
 def generate_timetable(semester_id: int, semester_instance: str):
     """
     Main entry point for timetable generation
@@ -543,8 +1322,8 @@ def generate_timetable(semester_id: int, semester_instance: str):
         Dictionary with timetable data and generation stats
     """
     from core.models import (
-        ClassSection, Subject, Faculty, TimeSlot, 
-        FacultySubjectAssignment, TimetableEntry
+        ClassSection, Subject, Faculty, 
+        FacultySubjectAssignment
     )
     
     # Load data from database
@@ -554,49 +1333,39 @@ def generate_timetable(semester_id: int, semester_instance: str):
     
     subjects = list(Subject.objects.filter(
         semester_id=semester_id
-    ).values('id', 'name', 'code', 'subject_type', 'hours_per_week', 'semester_id'))
+    ).values('id', 'name', 'code', 'subject_type', 'semester_id', hours_per_week=SUBJECT_WEEKLY_HOURS))
     
     faculties = list(Faculty.objects.filter(
         is_active=True
-    ).values('id', 'name', 'designation', 'preferences'))
+    ).values('id', 'name', 'designation', 'preference_codes'))
     
     # Add max_hours to faculty data
     for f in faculties:
         f['max_hours'] = Faculty.WORKLOAD_LIMITS.get(f['designation'], 20)
     
     # VALIDATE TIME SLOTS - Only use teaching slots (not lunch)
-    time_slots = list(TimeSlot.objects.filter(
-        slot_type__in=['MORNING', 'AFTERNOON']
-    ).values('id', 'day', 'period'))
-    
-    if not time_slots:
-        return {
-            'success': False,
-            'error': 'No time slots configured. Please initialize time slots first.'
-        }
-    
-    # Verify we have the expected number of teaching slots
-    expected_slots = 7 * 5  # 7 periods × 5 days
-    if len(time_slots) != expected_slots:
+    time_slots, slot_error = _load_teaching_slots()
+    if slot_error:
         return {
             'success': False,
-            'error': f'Invalid time slot configuration. Expected {expected_slots} teaching slots, found {len(time_slots)}. Please re-initialize time slots.'
+            'error': slot_error
         }
     
-    # Load faculty preferences
-    faculty_preferences = {}
-    for f in faculties:
-        if f['preferences']:
-            faculty_preferences[f['id']] = [p.strip() for p in f['preferences'].split(',')]
+    # Load faculty preferences, already parsed when each faculty was saved
+    faculty_preferences = {
+        f['id']: f['preference_codes'] for f in faculties if f['preference_codes']
+    }
     
     # Load faculty history for subject rotation
-    faculty_history = defaultdict(list)
+    # Streamed in chunks, and each code is kept once per faculty, so memory
+    # stays bounded however many past semesters have accumulated
+    faculty_history = defaultdict(set)
     assignments = FacultySubjectAssignment.objects.exclude(
         semester_instance=semester_instance
-    ).select_related('subject')
+    ).values_list('faculty_id', 'subject__code')
     
-    for assignment in assignments:
-        faculty_history[assignment.faculty_id].append(assignment.subject.code)
+    for faculty_id, subject_code in assignments.iterator(chunk_size=2000):
+        faculty_history[faculty_id].add(subject_code)
     
     # Initialize and run GA
     ga = GeneticAlgorithm(
@@ -619,43 +1388,12 @@ def generate_timetable(semester_id: int, semester_instance: str):
     
     best_solution, fitness_history = ga.evolve()
     
-    # Clear existing entries for this semester instance
-    TimetableEntry.objects.filter(
-        class_section__semester_id=semester_id,
-        semester_instance=semester_instance
-    ).delete()
-    
-    # Save solution to database
-    entries_created = []
-    for gene in best_solution.genes:
-        entry = TimetableEntry.objects.create(
-            class_section_id=gene.class_id,
-            subject_id=gene.subject_id,
-            faculty_id=gene.faculty_id,
-            time_slot_id=gene.time_slot_id,
-            semester_instance=semester_instance,
-            is_lab_session=gene.is_lab,
-            assistant_faculty_id=gene.assistant_faculty_id
-        )
-        entries_created.append(entry)
+    # Replace existing entries for this semester instance in one transaction
+    with transaction.atomic():
+        _delete_timetable_entries([semester_id], semester_instance)
         
-        # Also create faculty-subject assignment for tracking
-        FacultySubjectAssignment.objects.get_or_create(
-            faculty_id=gene.faculty_id,
-            subject_id=gene.subject_id,
-            semester_instance=semester_instance,
-            class_section_id=gene.class_id,
-            defaults={'is_main': True}
-        )
-        
-        if gene.assistant_faculty_id:
-            FacultySubjectAssignment.objects.get_or_create(
-                faculty_id=gene.assistant_faculty_id,
-                subject_id=gene.subject_id,
-                semester_instance=semester_instance,
-                class_section_id=gene.class_id,
-                defaults={'is_main': False}
-            )
+        # Save solution to database
+        entries_created = _save_timetable_entries(ga.decode(best_solution), semester_instance)
     
     return {
         'success': True,
@@ -681,33 +1419,33 @@ def generate_department_timetable(department_id: int, semester_instance: str):
         Dictionary with structured timetable data grouped by semester and class
     """
     from core.models import (
-        Department, Semester, ClassSection, Subject, Faculty, TimeSlot,
-        FacultySubjectAssignment, TimetableEntry, SystemConfiguration
+        Department, Semester, ClassSection, Subject, Faculty,
+        FacultySubjectAssignment, SystemConfiguration
     )
     
     # Get department info
-    department = Department.objects.get(id=department_id)
+    department = Department.objects.values('id', 'name', 'code').get(id=department_id)
     
     # Determine which semester numbers to include based on ODD/EVEN
-    config = SystemConfiguration.objects.first()
-    if config and config.active_semester_type == 'ODD':
-        semester_numbers = [1, 3, 5, 7]
-    else:
-        semester_numbers = [2, 4, 6, 8]
+    config = SystemConfiguration.objects.values('active_semester_type').first()
+    semester_type = config['active_semester_type'] if config else 'EVEN'
+    semester_numbers = SystemConfiguration.SEMESTER_NUMBERS.get(
+        semester_type, SystemConfiguration.SEMESTER_NUMBERS['EVEN']
+    )
     
     # Get all semesters for this department matching the active type
-    semesters = Semester.objects.filter(
+    semesters = list(Semester.objects.filter(
         department_id=department_id,
         number__in=semester_numbers
-    ).order_by('number')
+    ).order_by('number').values('id', 'number'))
     
-    if not semesters.exists():
+    if not semesters:
         return {
             'success': False,
-            'error': f'No {config.active_semester_type} semesters found for {department.code}'
+            'error': f'No {semester_type} semesters found for {department["code"]}'
         }
     
-    semester_ids = list(semesters.values_list('id', flat=True))
+    semester_ids = [s['id'] for s in semesters]
     
     # Get ALL classes across all semesters in this department
     classes = list(ClassSection.objects.filter(
@@ -717,18 +1455,18 @@ def generate_department_timetable(department_id: int, semester_instance: str):
     if not classes:
         return {
             'success': False,
-            'error': f'No classes found for {department.code} in {config.active_semester_type} semesters'
+            'error': f'No classes found for {department["code"]} in {semester_type} semesters'
         }
     
     # Get ALL subjects across all semesters in this department
     subjects = list(Subject.objects.filter(
         semester_id__in=semester_ids
-    ).values('id', 'name', 'code', 'subject_type', 'hours_per_week', 'semester_id'))
+    ).values('id', 'name', 'code', 'subject_type', 'semester_id', hours_per_week=SUBJECT_WEEKLY_HOURS))
     
     if not subjects:
         return {
             'success': False,
-            'error': f'No subjects found for {department.code}'
+            'error': f'No subjects found for {department["code"]}'
         }
     
     # Get all active faculty (department-wide or unassigned)
@@ -736,57 +1474,41 @@ def generate_department_timetable(department_id: int, semester_instance: str):
         is_active=True
     ).filter(
         Q(department_id=department_id) | Q(department_id__isnull=True)
-    ).values('id', 'name', 'designation', 'preferences'))
+    ).values('id', 'name', 'designation', 'preference_codes'))
     
     if not faculties:
         # Fallback to all active faculty
         faculties = list(Faculty.objects.filter(
             is_active=True
-        ).values('id', 'name', 'designation', 'preferences'))
+        ).values('id', 'name', 'designation', 'preference_codes'))
     
     # Add max_hours to faculty data
     for f in faculties:
         f['max_hours'] = Faculty.WORKLOAD_LIMITS.get(f['designation'], 20)
     
     # VALIDATE TIME SLOTS - Only use teaching slots (not lunch)
-    time_slots = list(TimeSlot.objects.filter(
-        slot_type__in=['MORNING', 'AFTERNOON']
-    ).values('id', 'day', 'period'))
-    
-    if not time_slots:
-        return {
-            'success': False,
-            'error': 'No time slots configured. Please initialize time slots first.'
-        }
-    
-    # Verify we have the expected number of teaching slots
-    expected_slots = 7 * 5  # 7 periods × 5 days
-    if len(time_slots) != expected_slots:
-        return {
-            'success': False,
-            'error': f'Invalid time slot configuration. Expected {expected_slots} teaching slots, found {len(time_slots)}. Please re-initialize time slots.'
-        }
-    
-    if not time_slots:
+    time_slots, slot_error = _load_teaching_slots()
+    if slot_error:
         return {
             'success': False,
-            'error': 'No time slots configured. Please initialize time slots first.'
+            'error': slot_error
         }
     
-    # Load faculty preferences
-    faculty_preferences = {}
-    for f in faculties:
-        if f['preferences']:
-            faculty_preferences[f['id']] = [p.strip() for p in f['preferences'].split(',')]
+    # Load faculty preferences, already parsed when each faculty was saved
+    faculty_preferences = {
+        f['id']: f['preference_codes'] for f in faculties if f['preference_codes']
+    }
     
     # Load faculty history for subject rotation
-    faculty_history = defaultdict(list)
+    # Streamed in chunks, and each code is kept once per faculty, so memory
+    # stays bounded however many past semesters have accumulated
+    faculty_history = defaultdict(set)
     assignments = FacultySubjectAssignment.objects.exclude(
         semester_instance=semester_instance
-    ).select_related('subject')
+    ).values_list('faculty_id', 'subject__code')
     
-    for assignment in assignments:
-        faculty_history[assignment.faculty_id].append(assignment.subject.code)
+    for faculty_id, subject_code in assignments.iterator(chunk_size=2000):
+        faculty_history[faculty_id].add(subject_code)
     
     # Initialize and run GA for entire department
     ga = GeneticAlgorithm(
@@ -809,79 +1531,50 @@ def generate_department_timetable(department_id: int, semester_instance: str):
     
     best_solution, fitness_history = ga.evolve()
     
-    # Clear existing entries for ALL semesters in this department for this instance
-    TimetableEntry.objects.filter(
-        class_section__semester_id__in=semester_ids,
-        semester_instance=semester_instance
-    ).delete()
+    genes = ga.decode(best_solution)
     
-    # Save solution to database and build structured response
-    entries_created = []
+    # Replace existing entries for ALL semesters in this department for this
+    # instance, in one transaction
+    with transaction.atomic():
+        _delete_timetable_entries(semester_ids, semester_instance)
+        
+        # Save solution to database
+        entries_created = _save_timetable_entries(genes, semester_instance)
+    
+    # Build structured response
     timetables_by_semester = {}
     
     # Build semester info map
-    semester_info = {s.id: {'number': s.number, 'name': str(s)} for s in semesters}
+    semester_info = {
+        s['id']: {'number': s['number'], 'name': f"S{s['number']} ({department['code']})"}
+        for s in semesters
+    }
     
-    # Build class info map
-    class_info = {c['id']: c for c in classes}
+    # Count entries per class in one pass over the chromosome's class
+    # column; genes are grouped by class in class order, so walking the
+    # classes keeps the order the response always had
+    class_counts = np.bincount(best_solution.class_idx, minlength=len(classes)).tolist()
     
-    for gene in best_solution.genes:
-        entry = TimetableEntry.objects.create(
-            class_section_id=gene.class_id,
-            subject_id=gene.subject_id,
-            faculty_id=gene.faculty_id,
-            time_slot_id=gene.time_slot_id,
-            semester_instance=semester_instance,
-            is_lab_session=gene.is_lab,
-            assistant_faculty_id=gene.assistant_faculty_id
-        )
-        entries_created.append(entry)
-        
-        # Build structured response
-        class_data = class_info.get(gene.class_id, {})
-        sem_id = class_data.get('semester_id')
-        
-        if sem_id and sem_id in semester_info:
-            if sem_id not in timetables_by_semester:
-                timetables_by_semester[sem_id] = {
-                    'semester_number': semester_info[sem_id]['number'],
-                    'semester_name': semester_info[sem_id]['name'],
-                    'classes': {}
-                }
-            
-            if gene.class_id not in timetables_by_semester[sem_id]['classes']:
-                timetables_by_semester[sem_id]['classes'][gene.class_id] = {
-                    'class_name': class_data.get('name', 'Unknown'),
-                    'entry_count': 0
-                }
-            
-            timetables_by_semester[sem_id]['classes'][gene.class_id]['entry_count'] += 1
+    for class_data, entry_count in zip(classes, class_counts):
+        sem_id = class_data['semester_id']
+        if not entry_count or sem_id not in semester_info:
+            continue
         
-        # Create faculty-subject assignment for tracking
-        FacultySubjectAssignment.objects.get_or_create(
-            faculty_id=gene.faculty_id,
-            subject_id=gene.subject_id,
-            semester_instance=semester_instance,
-            class_section_id=gene.class_id,
-            defaults={'is_main': True}
-        )
+        if sem_id not in timetables_by_semester:
+            timetables_by_semester[sem_id] = {
+                'semester_number': semester_info[sem_id]['number'],
+                'semester_name': semester_info[sem_id]['name'],
+                'classes': {}
+            }
         
-        if gene.assistant_faculty_id:
-            FacultySubjectAssignment.objects.get_or_create(
-                faculty_id=gene.assistant_faculty_id,
-                subject_id=gene.subject_id,
-                semester_instance=semester_instance,
-                class_section_id=gene.class_id,
-                defaults={'is_main': False}
-            )
+        timetables_by_semester[sem_id]['classes'][class_data['id']] = {
+            'class_name': class_data.get('name', 'Unknown'),
+            'entry_count': entry_count
+        }
     
     return {
         'success': True,
-        'department': {
-            'id': department.id,
-            'name': department.name,
-            'code': department.code
-        },
+        'department': department,
         'timetables': timetables_by_semester,
         'total_entries': len(entries_created),
         'classes_count': len(classes),
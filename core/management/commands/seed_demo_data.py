@@ -7,7 +7,6 @@ from core.models import (
     Department, Semester, ClassSection, Faculty, Subject,
     SystemConfiguration
 )
-from core.views import _create_time_slots
 from datetime import time
 
 
@@ -79,27 +78,44 @@ class Command(BaseCommand):
 
     def create_semesters_and_classes(self, departments):
         """Create semesters and classes for departments"""
-        semesters = []
-        
-        for dept in departments:
-            # Create even semesters (2, 4, 6, 8)
-            for sem_num in [2, 4, 6, 8]:
-                semester, created = Semester.objects.get_or_create(
-                    number=sem_num,
-                    department=dept
-                )
-                semesters.append(semester)
-                
-                if created:
-                    self.stdout.write(f'  ✓ Created semester: S{sem_num} for {dept.code}')
-                
-                # Create 4 classes per semester
-                for class_name in ['A', 'B', 'C', 'D']:
-                    ClassSection.objects.get_or_create(
-                        name=class_name,
-                        semester=semester,
-                        defaults={'capacity': 60}
-                    )
+        # Create even semesters (2, 4, 6, 8)
+        semester_numbers = [2, 4, 6, 8]
+        wanted = [(dept, sem_num) for dept in departments for sem_num in semester_numbers]
+        
+        existing = set(Semester.objects.filter(
+            department__in=departments,
+            number__in=semester_numbers
+        ).values_list('department_id', 'number'))
+        
+        new_semesters = [
+            Semester(number=sem_num, department=dept)
+            for dept, sem_num in wanted
+            if (dept.id, sem_num) not in existing
+        ]
+        Semester.objects.bulk_create(new_semesters, ignore_conflicts=True)
+        for semester in new_semesters:
+            self.stdout.write(f'  ✓ Created semester: S{semester.number} for {semester.department.code}')
+        
+        # ignore_conflicts does not report primary keys, so read them back
+        by_key = {
+            (s.department_id, s.number): s
+            for s in Semester.objects.filter(
+                department__in=departments,
+                number__in=semester_numbers
+            ).select_related('department')
+        }
+        semesters = [by_key[(dept.id, sem_num)] for dept, sem_num in wanted]
+        
+        # Create 4 classes per semester
+        existing_classes = set(ClassSection.objects.filter(
+            semester__in=semesters
+        ).values_list('semester_id', 'name'))
+        ClassSection.objects.bulk_create([
+            ClassSection(name=class_name, semester=semester, capacity=60)
+            for semester in semesters
+            for class_name in ['A', 'B', 'C', 'D']
+            if (semester.id, class_name) not in existing_classes
+        ], ignore_conflicts=True)
         
         self.stdout.write(f'  ✓ Created {ClassSection.objects.count()} classes')
         return semesters
@@ -170,31 +186,41 @@ class Command(BaseCommand):
         # Create subjects for CS department semesters
         cs_semesters = [s for s in semesters if s.department.code == 'CS']
         
+        new_subjects = []
         for semester in cs_semesters:
             for idx, (name, code_prefix, sub_type, L, T, P, credits) in enumerate(subjects_template, 1):
                 # Create unique code: CS201, CS202, etc.
                 unique_code = f'{semester.department.code}{semester.number}{idx:02d}'
                 full_name = f'{name} - S{semester.number}'
                 
-                Subject.objects.get_or_create(
+                new_subjects.append(Subject(
                     code=unique_code,
-                    defaults={
-                        'name': full_name,
-                        'department': semester.department,
-                        'semester': semester,
-                        'subject_type': sub_type,
-                        'lecture_hours': L,
-                        'tutorial_hours': T,
-                        'practical_hours': P,
-                        'credits': credits
-                    }
-                )
+                    name=full_name,
+                    department=semester.department,
+                    semester=semester,
+                    subject_type=sub_type,
+                    lecture_hours=L,
+                    tutorial_hours=T,
+                    practical_hours=P,
+                    credits=credits
+                ))
+        
+        existing_codes = set(Subject.objects.filter(
+            code__in=[subject.code for subject in new_subjects]
+        ).values_list('code', flat=True))
+        Subject.objects.bulk_create(
+            [subject for subject in new_subjects if subject.code not in existing_codes],
+            ignore_conflicts=True,
+            batch_size=500
+        )
         
         self.stdout.write(f'  ✓ Created {Subject.objects.count()} subjects')
 
     def initialize_time_slots(self):
         """Initialize time slots"""
         from core.models import TimeSlot
+        # Imported here so other manage.py commands don't load the views and GA
+        from core.views import _create_time_slots
         
         if TimeSlot.objects.exists():
             self.stdout.write('  ℹ Time slots already exist')
@@ -0,0 +1,31 @@
+# Generated by Django 6.0.1 on 2026-10-16 10:12
+
+from django.db import migrations, models
+
+
+def parse_existing_preferences(apps, schema_editor):
+    """Fill preference_codes from the comma-separated preferences text"""
+    Faculty = apps.get_model('core', 'Faculty')
+    faculty_list = list(Faculty.objects.only('id', 'preferences'))
+    for faculty in faculty_list:
+        if faculty.preferences:
+            faculty.preference_codes = [p.strip() for p in faculty.preferences.split(',')]
+        else:
+            faculty.preference_codes = []
+    Faculty.objects.bulk_update(faculty_list, ['preference_codes'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_add_ltp_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='faculty',
+            name='preference_codes',
+            field=models.JSONField(blank=True, default=list, editable=False, help_text='Parsed form of preferences, kept in sync on save'),
+        ),
+        migrations.RunPython(parse_existing_preferences, migrations.RunPython.noop),
+    ]
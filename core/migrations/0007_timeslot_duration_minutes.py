@@ -0,0 +1,30 @@
+# Generated by Django 6.0.1 on 2026-10-16 10:41
+
+from django.db import migrations, models
+
+
+def compute_durations(apps, schema_editor):
+    """Store the duration of every existing time slot"""
+    TimeSlot = apps.get_model('core', 'TimeSlot')
+    slots = list(TimeSlot.objects.only('id', 'start_time', 'end_time'))
+    for slot in slots:
+        start = slot.start_time.hour * 3600 + slot.start_time.minute * 60 + slot.start_time.second
+        end = slot.end_time.hour * 3600 + slot.end_time.minute * 60 + slot.end_time.second
+        slot.duration_minutes = (end - start) // 60
+    TimeSlot.objects.bulk_update(slots, ['duration_minutes'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_faculty_preference_codes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='timeslot',
+            name='duration_minutes',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='Slot length in minutes, computed from start and end time on save'),
+        ),
+        migrations.RunPython(compute_durations, migrations.RunPython.noop),
+    ]
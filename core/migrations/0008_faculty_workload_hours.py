@@ -0,0 +1,34 @@
+# Generated by Django 6.0.1 on 2026-10-16 11:20
+
+from django.db import migrations, models
+
+
+def count_workload(apps, schema_editor):
+    """Store the current number of timetable entries for every faculty member"""
+    Faculty = apps.get_model('core', 'Faculty')
+    TimetableEntry = apps.get_model('core', 'TimetableEntry')
+    counts = dict(
+        TimetableEntry.objects.order_by().values('faculty').annotate(
+            total=models.Count('id')
+        ).values_list('faculty', 'total')
+    )
+    faculty = list(Faculty.objects.only('id'))
+    for member in faculty:
+        member.workload_hours = counts.get(member.id, 0)
+    Faculty.objects.bulk_update(faculty, ['workload_hours'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_timeslot_duration_minutes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='faculty',
+            name='workload_hours',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='Number of assigned timetable entries, kept in sync by signals'),
+        ),
+        migrations.RunPython(count_workload, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-16 11:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_faculty_workload_hours'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='timetableentry',
+            index=models.Index(fields=['semester_instance', 'class_section'], name='core_timeta_semeste_fbe707_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.1 on 2026-10-16 12:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_timetableentry_instance_class_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='timetableentry',
+            index=models.Index(fields=['semester_instance', 'faculty'], name='core_timeta_semeste_7d8ef5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timetableentry',
+            index=models.Index(fields=['semester_instance', 'time_slot'], name='core_timeta_semeste_9999b4_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 6.0.1 on 2026-10-16 12:40
+
+from django.db import migrations, models
+
+
+def remove_duplicate_assignments(apps, schema_editor):
+    """Keep the oldest row of each (faculty, subject, instance, class) group"""
+    FacultySubjectAssignment = apps.get_model('core', 'FacultySubjectAssignment')
+    seen = set()
+    duplicates = []
+    rows = FacultySubjectAssignment.objects.order_by('id').values_list(
+        'id', 'faculty_id', 'subject_id', 'semester_instance', 'class_section_id'
+    )
+    for row_id, *key in rows.iterator(chunk_size=2000):
+        key = tuple(key)
+        if key in seen:
+            duplicates.append(row_id)
+        else:
+            seen.add(key)
+    FacultySubjectAssignment.objects.filter(id__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_timetableentry_instance_faculty_slot_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_assignments, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='facultysubjectassignment',
+            constraint=models.UniqueConstraint(fields=('faculty', 'subject', 'semester_instance', 'class_section'), name='uniq_faculty_subject_assignment'),
+        ),
+    ]
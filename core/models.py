@@ -1,5 +1,9 @@
+from uuid import uuid4
+
 from django.db import models
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils.functional import cached_property
 
 
 class Department(models.Model):
@@ -109,28 +113,97 @@ class Faculty(models.Model):
         related_name='faculty_members'
     )
     preferences = models.TextField(blank=True, help_text="Comma-separated preferred subject codes")
+    preference_codes = models.JSONField(
+        default=list,
+        blank=True,
+        editable=False,
+        help_text="Parsed form of preferences, kept in sync on save"
+    )
+    workload_hours = models.PositiveSmallIntegerField(
+        default=0,
+        editable=False,
+        help_text="Number of assigned timetable entries, kept in sync by signals"
+    )
     is_active = models.BooleanField(default=True)
     
+    # Profiles looked up by user are cached under a shared version, so one
+    # bump invalidates them all, including after bulk updates
+    USER_CACHE_VERSION_KEY = 'faculty:version'
+    USER_CACHE_TIMEOUT = 300
+    
+    @classmethod
+    def for_user(cls, user):
+        """Faculty profile linked to a user (cached), or None"""
+        version = cache.get_or_set(cls.USER_CACHE_VERSION_KEY, lambda: uuid4().hex, None)
+        key = f'faculty:u:{user.pk}:{version}'
+        faculty = cache.get(key)
+        if faculty is None:
+            faculty = cls.objects.filter(user=user).first()
+            if faculty is not None:
+                cache.set(key, faculty, cls.USER_CACHE_TIMEOUT)
+        return faculty
+    
+    @classmethod
+    def clear_user_cache(cls):
+        """Invalidate every cached profile returned by for_user"""
+        cache.set(cls.USER_CACHE_VERSION_KEY, uuid4().hex, None)
+    
     @property
     def max_hours(self):
         return self.WORKLOAD_LIMITS.get(self.designation, 20)
     
     @property
     def current_workload(self):
-        """Calculate current assigned hours from timetable entries"""
-        from django.db.models import Count
-        entries = self.timetable_entries.count()
-        return entries  # Each entry is 1 hour
+        """Current assigned hours (each timetable entry is 1 hour)"""
+        return self.workload_hours
+    
+    @classmethod
+    def recalculate_workload(cls, faculty_ids=None):
+        """
+        Recount workload_hours from timetable entries in a single UPDATE.
+        
+        Bulk inserts skip the per-row signals, so callers that use them
+        refresh the affected faculty here.
+        """
+        from django.db.models import Count, OuterRef, Subquery
+        from django.db.models.functions import Coalesce
+        
+        entry_count = TimetableEntry.objects.filter(
+            faculty=OuterRef('pk')
+        ).order_by().values('faculty').annotate(total=Count('id')).values('total')
+        
+        queryset = cls.objects.all()
+        if faculty_ids is not None:
+            queryset = queryset.filter(pk__in=faculty_ids)
+        updated = queryset.update(
+            workload_hours=Coalesce(Subquery(entry_count), 0)
+        )
+        cls.clear_user_cache()
+        return updated
     
     @property
     def available_hours(self):
         return self.max_hours - self.current_workload
     
-    def get_preference_list(self):
-        if self.preferences:
-            return [p.strip() for p in self.preferences.split(',')]
+    @staticmethod
+    def parse_preferences(preferences):
+        """Split a comma-separated preferences string into subject codes"""
+        if preferences:
+            return [p.strip() for p in preferences.split(',')]
         return []
     
+    @cached_property
+    def preference_list(self):
+        return self.parse_preferences(self.preferences)
+    
+    def save(self, *args, **kwargs):
+        self.preference_codes = self.parse_preferences(self.preferences)
+        self.__dict__.pop('preference_list', None)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'preferences' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'preference_codes'}
+        super().save(*args, **kwargs)
+    
     def __str__(self):
         return f"{self.name} ({self.get_designation_display()})"
     
@@ -191,6 +264,12 @@ class FacultySubjectAssignment(models.Model):
     
     class Meta:
         ordering = ['-semester_instance', 'faculty']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['faculty', 'subject', 'semester_instance', 'class_section'],
+                name='uniq_faculty_subject_assignment'
+            ),
+        ]
 
 
 class TimeSlot(models.Model):
@@ -209,12 +288,20 @@ class TimeSlot(models.Model):
         ('LUNCH', 'Lunch Break'),
     ]
     
+    # Fields that cannot change while the slot is locked
+    LOCKED_FIELDS = ('day', 'period', 'start_time', 'end_time', 'slot_type')
+    
     day = models.CharField(max_length=3, choices=DAY_CHOICES)
     period = models.IntegerField()  # 1-7 for teaching, 0 for lunch
     start_time = models.TimeField()  # Made required (no null/blank)
     end_time = models.TimeField()    # Made required (no null/blank)
     slot_type = models.CharField(max_length=10, choices=SLOT_TYPE_CHOICES, default='MORNING')
     is_locked = models.BooleanField(default=True, help_text="Prevent modifications to slot")
+    duration_minutes = models.PositiveSmallIntegerField(
+        default=0,
+        editable=False,
+        help_text="Slot length in minutes, computed from start and end time on save"
+    )
     
     @property
     def is_morning(self):
@@ -233,30 +320,41 @@ class TimeSlot(models.Model):
     def slot_name(self):
         return f"{self.get_day_display()} Period {self.period}"
     
-    @property
-    def duration_minutes(self):
-        """Calculate slot duration in minutes"""
-        from datetime import datetime
-        start = datetime.combine(datetime.today(), self.start_time)
-        end = datetime.combine(datetime.today(), self.end_time)
-        return int((end - start).total_seconds() / 60)
+    @staticmethod
+    def minutes_between(start_time, end_time):
+        """Whole minutes from start_time to end_time on the same day"""
+        start = start_time.hour * 3600 + start_time.minute * 60 + start_time.second
+        end = end_time.hour * 3600 + end_time.minute * 60 + end_time.second
+        return (end - start) // 60
     
     def __str__(self):
         if self.slot_type == 'LUNCH':
             return f"{self.day}-LUNCH"
         return f"{self.day}-P{self.period}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Snapshot the stored schedule so save() can detect edits without a query
+        instance._loaded_values = {
+            name: instance.__dict__[name]
+            for name in cls.LOCKED_FIELDS if name in instance.__dict__
+        }
+        return instance
+    
     def save(self, *args, **kwargs):
         """Prevent modifications to locked slots"""
         if self.pk and self.is_locked:
-            # Check if this is just unlocking the slot
-            old = TimeSlot.objects.get(pk=self.pk)
+            old = getattr(self, '_loaded_values', {})
+            if len(old) < len(self.LOCKED_FIELDS):
+                # Built by hand or loaded with deferred fields; read the stored row
+                old = TimeSlot.objects.filter(pk=self.pk).values(*self.LOCKED_FIELDS).first() or {}
             # Allow only is_locked field changes
-            if (old.day != self.day or old.period != self.period or 
-                old.start_time != self.start_time or old.end_time != self.end_time or
-                old.slot_type != self.slot_type):
+            if any(old[name] != getattr(self, name) for name in old):
                 raise ValueError("Cannot modify locked time slot. Unlock it first.")
+        self.duration_minutes = self.minutes_between(self.start_time, self.end_time)
         super().save(*args, **kwargs)
+        self._loaded_values = {name: getattr(self, name) for name in self.LOCKED_FIELDS}
     
     class Meta:
         unique_together = ['day', 'period']
@@ -283,11 +381,35 @@ class TimetableEntry(models.Model):
     is_lab_session = models.BooleanField(default=False)
     lab_session_number = models.IntegerField(null=True, blank=True, help_text="1 or 2 for weekly lab sessions")
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored faculty so a reassignment can move the workload
+        instance._loaded_faculty_id = instance.__dict__.get('faculty_id')
+        return instance
+    
+    GRID_CACHE_VERSION_KEY = 'timetable:version'
+    
+    @classmethod
+    def grid_cache_version(cls):
+        """Version tag keying the cached timetable_view data"""
+        return cache.get_or_set(cls.GRID_CACHE_VERSION_KEY, lambda: uuid4().hex, None)
+    
+    @classmethod
+    def clear_grid_cache(cls):
+        """Invalidate all cached timetable_view data"""
+        cache.set(cls.GRID_CACHE_VERSION_KEY, uuid4().hex, None)
+    
     def __str__(self):
         return f"{self.class_section} | {self.time_slot} | {self.subject.code} | {self.faculty.name}"
     
     class Meta:
         ordering = ['class_section', 'time_slot']
+        indexes = [
+            models.Index(fields=['semester_instance', 'class_section']),
+            models.Index(fields=['semester_instance', 'faculty']),
+            models.Index(fields=['semester_instance', 'time_slot']),
+        ]
 
 
 class SystemConfiguration(models.Model):
@@ -302,6 +424,29 @@ class SystemConfiguration(models.Model):
     periods_per_day = models.IntegerField(default=7)
     days_per_week = models.IntegerField(default=5)
     
+    # Semester numbers taught in each half of the academic year
+    SEMESTER_NUMBERS = {
+        'ODD': (1, 3, 5, 7),
+        'EVEN': (2, 4, 6, 8),
+    }
+    
+    # Read on almost every request; signals drop the cached copy on change
+    CACHE_KEY = 'sysconfig'
+    CACHE_TIMEOUT = 300
+    
+    @classmethod
+    def get_config(cls):
+        """The configuration singleton, cached and created on first use"""
+        config = cache.get(cls.CACHE_KEY)
+        if config is None:
+            config = cls.objects.first() or cls.objects.create()
+            cache.set(cls.CACHE_KEY, config, cls.CACHE_TIMEOUT)
+        return config
+    
+    @property
+    def active_semester_numbers(self):
+        return self.SEMESTER_NUMBERS.get(self.active_semester_type, self.SEMESTER_NUMBERS['EVEN'])
+    
     def get_semester_instance(self):
         year = self.current_academic_year.split('-')[0]
         return f"{year}-{self.active_semester_type}"
@@ -0,0 +1,108 @@
+"""
+Signal handlers keeping denormalized counters and caches in sync
+"""
+from django.core.cache import cache
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import (
+    ClassSection, Department, Faculty, Semester, Subject, SystemConfiguration, TimeSlot, TimetableEntry
+)
+
+# Cached (faculty, subject, class) totals shown on the admin dashboard
+DASHBOARD_COUNTS_KEY = 'admin:dashboard:counts'
+
+
+def _adjust_workload(faculty_id, delta):
+    """Shift a faculty member's workload counter without reading it first"""
+    if faculty_id is None:
+        return
+    queryset = Faculty.objects.filter(pk=faculty_id)
+    if delta < 0:
+        queryset = queryset.filter(workload_hours__gte=-delta)
+    queryset.update(workload_hours=F('workload_hours') + delta)
+    Faculty.clear_user_cache()
+
+
+@receiver(pre_save, sender=TimetableEntry)
+def load_stored_faculty(sender, instance, **kwargs):
+    """Read the stored faculty of an entry saved without being loaded first"""
+    # Built by hand with a pk, or returned by bulk_create; without this the
+    # old faculty would keep the hour when the entry moves
+    if instance.pk is not None and not hasattr(instance, '_loaded_faculty_id'):
+        instance._loaded_faculty_id = TimetableEntry.objects.filter(
+            pk=instance.pk
+        ).values_list('faculty_id', flat=True).first()
+
+
+@receiver(post_save, sender=TimetableEntry)
+def count_saved_entry(sender, instance, created, **kwargs):
+    """Add a saved entry to its faculty's workload, moving it on reassignment"""
+    previous = getattr(instance, '_loaded_faculty_id', None)
+    if created:
+        _adjust_workload(instance.faculty_id, 1)
+    elif previous != instance.faculty_id:
+        _adjust_workload(previous, -1)
+        _adjust_workload(instance.faculty_id, 1)
+    instance._loaded_faculty_id = instance.faculty_id
+    TimetableEntry.clear_grid_cache()
+
+
+@receiver(post_delete, sender=TimetableEntry)
+def count_deleted_entry(sender, instance, **kwargs):
+    """Remove a deleted entry from its faculty's workload"""
+    _adjust_workload(instance.faculty_id, -1)
+    TimetableEntry.clear_grid_cache()
+
+
+@receiver(post_save, sender=Faculty)
+@receiver(post_delete, sender=Faculty)
+def clear_faculty_profiles(sender, **kwargs):
+    """Drop cached faculty profiles whenever a faculty member changes"""
+    Faculty.clear_user_cache()
+
+
+@receiver(post_save, sender=TimeSlot)
+@receiver(post_delete, sender=TimeSlot)
+def clear_teaching_slots(sender, **kwargs):
+    """Drop the cached teaching slots whenever a slot changes"""
+    # Imported here so app startup does not load NumPy and the GA
+    from .genetic_algorithm import _get_teaching_slots
+    
+    _get_teaching_slots.cache_clear()
+
+
+@receiver(post_save, sender=SystemConfiguration)
+@receiver(post_delete, sender=SystemConfiguration)
+def clear_system_config(sender, **kwargs):
+    """Drop the cached configuration whenever it is saved or removed"""
+    cache.delete(SystemConfiguration.CACHE_KEY)
+
+
+@receiver(post_save, sender=Faculty)
+@receiver(post_delete, sender=Faculty)
+@receiver(post_save, sender=Subject)
+@receiver(post_delete, sender=Subject)
+@receiver(post_save, sender=ClassSection)
+@receiver(post_delete, sender=ClassSection)
+def clear_dashboard_counts(sender, **kwargs):
+    """Drop the cached dashboard totals whenever a counted row changes"""
+    cache.delete(DASHBOARD_COUNTS_KEY)
+
+
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+@receiver(post_save, sender=Semester)
+@receiver(post_delete, sender=Semester)
+@receiver(post_save, sender=ClassSection)
+@receiver(post_delete, sender=ClassSection)
+@receiver(post_save, sender=Faculty)
+@receiver(post_delete, sender=Faculty)
+@receiver(post_save, sender=Subject)
+@receiver(post_delete, sender=Subject)
+@receiver(post_save, sender=TimeSlot)
+@receiver(post_delete, sender=TimeSlot)
+def clear_timetable_grids(sender, **kwargs):
+    """Drop cached timetable grids whenever a name or slot they show changes"""
+    TimetableEntry.clear_grid_cache()
@@ -1,3 +1,327 @@
-from django.test import TestCase
+from datetime import time
+from unittest import mock, skipIf
 
-# Create your tests here.
+import numpy as np
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core import genetic_algorithm
+from core.genetic_algorithm import Chromosome, GeneticAlgorithm
+from core.models import ClassSection, Department, Faculty, Semester, Subject, TimeSlot, TimetableEntry
+
+
+def make_ga(**kwargs):
+    """A small department: 2 semesters of 2 classes, with theory, lab and elective subjects"""
+    classes = [
+        {'id': 10 + i, 'name': name, 'semester_id': semester_id}
+        for i, (name, semester_id) in enumerate([('A', 1), ('B', 1), ('A', 2), ('B', 2)])
+    ]
+    subjects = []
+    for semester_id in (1, 2):
+        for n, (subject_type, hours) in enumerate([
+            ('THEORY', 4), ('THEORY', 3), ('THEORY', 3), ('LAB', 3), ('LAB', 3), ('ELECTIVE', 3)
+        ]):
+            subject_id = 100 + semester_id * 10 + n
+            subjects.append({
+                'id': subject_id, 'name': f'Subject {subject_id}', 'code': f'CS{subject_id}',
+                'subject_type': subject_type, 'hours_per_week': hours, 'semester_id': semester_id
+            })
+    faculties = [
+        {'id': 200 + i, 'name': f'Faculty {i}', 'designation': designation, 'max_hours': max_hours}
+        for i, (designation, max_hours) in enumerate([
+            ('PROFESSOR', 10), ('ASSOCIATE_PROFESSOR', 15), ('ASSISTANT_PROFESSOR', 20),
+            ('ASSISTANT_PROFESSOR', 20), ('ASSOCIATE_PROFESSOR', 15), ('PROFESSOR', 10),
+        ])
+    ]
+    # Teaching slots only, listed out of period order like the database may return them
+    time_slots = [
+        {'id': 300 + day_idx * 10 + period, 'day': day, 'period': period}
+        for day_idx, day in enumerate(['MON', 'TUE', 'WED', 'THU', 'FRI'])
+        for period in (5, 1, 6, 2, 7, 3, 4)
+    ]
+    ga = GeneticAlgorithm(population_size=20, seed=3, **kwargs)
+    ga.load_data(
+        classes=classes,
+        subjects=subjects,
+        faculties=faculties,
+        time_slots=time_slots,
+        faculty_preferences={200: ['CS110', 'CS113'], 203: ['CS121', 'CS124']},
+        faculty_history={201: {'CS111'}, 204: {'CS120', 'CS122'}},
+    )
+    return ga
+
+
+def class_clashes(chromosome):
+    """Number of genes booked into a slot their class already uses"""
+    keys = set(zip(chromosome.class_idx.tolist(), chromosome.slot_idx.tolist()))
+    return len(chromosome) - len(keys)
+
+
+class FitnessTests(SimpleTestCase):
+    """The scalar, batch and compiled fitness paths must score alike"""
+
+    def setUp(self):
+        self.ga = make_ga(mutation_rate=1.0)
+        # Greedy seeds are nearly clash-free and random ones are not; mutants
+        # and crossover children add the states the GA actually scores
+        self.population = self.ga.initialize_population()
+        for chromosome in list(self.population[:10]):
+            self.population.append(self.ga.mutate(chromosome))
+        for parent1, parent2 in zip(self.population[::2], self.population[1::2]):
+            self.population.extend(self.ga.crossover(parent1, parent2))
+
+    def numpy_fitness(self):
+        with mock.patch.object(genetic_algorithm, '_compiled_fitness_kernel', None):
+            return [self.ga.calculate_fitness(c) for c in self.population]
+
+    def test_population_fitness_matches_per_chromosome(self):
+        expected = self.numpy_fitness()
+        np.testing.assert_allclose(self.ga.calculate_population_fitness(self.population), expected)
+
+    def test_fitness_penalizes_constraint_violations(self):
+        fitness = self.numpy_fitness()
+        self.assertTrue(any(value < -1000 for value in fitness))
+        self.assertGreater(len(set(fitness)), 1)
+
+    @skipIf(genetic_algorithm._compiled_fitness_kernel is None, 'numba is not installed')
+    def test_compiled_kernel_matches_numpy(self):
+        expected = self.numpy_fitness()
+        np.testing.assert_allclose([self.ga.calculate_fitness(c) for c in self.population], expected)
+
+    @skipIf(genetic_algorithm._compiled_population_kernel is None, 'numba is not installed')
+    def test_compiled_population_kernel_matches_numpy(self):
+        expected = self.numpy_fitness()
+        for chromosome in self.population:
+            chromosome.fitness = None
+        self.ga._evaluate_batch(self.population, None)
+        np.testing.assert_allclose([c.fitness for c in self.population], expected)
+
+    def test_cutoff_score_stays_below_cutoff(self):
+        with mock.patch.object(genetic_algorithm, '_compiled_fitness_kernel', None):
+            for chromosome in self.population:
+                full = self.ga.calculate_fitness(chromosome)
+                cutoff = full + 1
+                self.assertLess(self.ga.calculate_fitness(chromosome, cutoff), cutoff)
+
+
+class OperatorTests(SimpleTestCase):
+    """Crossover and mutation keep the shared layout and the class/lab constraints"""
+
+    LAYOUT_FIELDS = ('class_idx', 'subject_idx', 'is_lab')
+
+    def setUp(self):
+        self.ga = make_ga(crossover_rate=1.0, mutation_rate=1.0)
+        self.population = self.ga.initialize_population()
+
+    def assertSameLayout(self, chromosome, reference):
+        for name in self.LAYOUT_FIELDS:
+            np.testing.assert_array_equal(getattr(chromosome, name), getattr(reference, name))
+        for name in Chromosome.GENE_FIELDS:
+            self.assertEqual(len(getattr(chromosome, name)), len(reference))
+
+    def lab_blocks_are_continuous(self, chromosome):
+        return all(
+            self.ga._check_lab_continuity(chromosome.slot_idx[
+                chromosome.is_lab &
+                (chromosome.class_idx == class_idx) &
+                (chromosome.subject_idx == subject_idx)
+            ])
+            for class_idx, subject_idx in set(zip(
+                chromosome.class_idx[chromosome.is_lab].tolist(),
+                chromosome.subject_idx[chromosome.is_lab].tolist()
+            ))
+        )
+
+    def test_population_shares_one_layout(self):
+        for chromosome in self.population[1:]:
+            self.assertSameLayout(chromosome, self.population[0])
+
+    def test_initial_chromosomes_satisfy_class_and_lab_constraints(self):
+        for chromosome in self.population:
+            self.assertEqual(class_clashes(chromosome), 0)
+            self.assertTrue(self.lab_blocks_are_continuous(chromosome))
+
+    def test_crossover_swaps_whole_classes(self):
+        parent1, parent2 = self.population[0], self.population[-1]
+        child1, child2 = self.ga.crossover(parent1, parent2)
+
+        for child in (child1, child2):
+            self.assertSameLayout(child, parent1)
+            self.assertEqual(class_clashes(child), 0)
+            self.assertTrue(self.lab_blocks_are_continuous(child))
+            # Each class's genes come from one parent
+            for class_idx in range(len(self.ga.classes)):
+                genes = child.class_idx == class_idx
+                from_parent1 = np.array_equal(child.slot_idx[genes], parent1.slot_idx[genes])
+                from_parent2 = np.array_equal(child.slot_idx[genes], parent2.slot_idx[genes])
+                self.assertTrue(from_parent1 or from_parent2)
+
+        # Between them the children hold every gene of both parents
+        swapped = child1.slot_idx != parent1.slot_idx
+        np.testing.assert_array_equal(child2.slot_idx[swapped], parent1.slot_idx[swapped])
+
+    def test_crossover_does_not_modify_parents(self):
+        parent1, parent2 = self.population[0], self.population[-1]
+        before = [c.copy() for c in (parent1, parent2)]
+        self.ga.crossover(parent1, parent2)
+        for chromosome, saved in zip((parent1, parent2), before):
+            for name in Chromosome.GENE_FIELDS:
+                np.testing.assert_array_equal(getattr(chromosome, name), getattr(saved, name))
+
+    def test_mutation_keeps_layout_and_constraints(self):
+        original = self.population[0]
+        saved = original.copy()
+        mutated = original
+        for _ in range(200):
+            mutated = self.ga.mutate(mutated)
+            self.assertSameLayout(mutated, original)
+            self.assertEqual(class_clashes(mutated), 0)
+            # Slots only move between genes of one class, so each class keeps its slots
+            for class_idx in range(len(self.ga.classes)):
+                genes = original.class_idx == class_idx
+                self.assertEqual(
+                    sorted(mutated.slot_idx[genes].tolist()), sorted(saved.slot_idx[genes].tolist())
+                )
+
+        self.assertTrue(mutated.dirty)
+        # Without in_place the chromosome passed in is left alone
+        np.testing.assert_array_equal(original.slot_idx, saved.slot_idx)
+        np.testing.assert_array_equal(original.faculty_idx, saved.faculty_idx)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class WorkloadTests(TestCase):
+    """Faculty.workload_hours follows the timetable entries assigned to each faculty"""
+
+    @classmethod
+    def setUpTestData(cls):
+        department = Department.objects.create(name='Computer Science & Engineering', code='CS')
+        semester = Semester.objects.create(number=3, department=department)
+        cls.class_section = ClassSection.objects.create(name='A', semester=semester)
+        cls.subject = Subject.objects.create(
+            name='Data Structures', code='CST201', department=department,
+            semester=semester, subject_type='THEORY'
+        )
+        cls.slots = [
+            TimeSlot.objects.create(
+                day='MON', period=period, start_time=time(8 + period), end_time=time(9 + period)
+            )
+            for period in (1, 2, 3)
+        ]
+        cls.faculty = Faculty.objects.create(name='Dr. Kumar', email='kumar@example.com', designation='PROFESSOR')
+        cls.other = Faculty.objects.create(name='Dr. Sharma', email='sharma@example.com', designation='PROFESSOR')
+
+    def make_entry(self, slot, faculty=None):
+        return TimetableEntry(
+            class_section=self.class_section, subject=self.subject, faculty=faculty or self.faculty,
+            time_slot=slot, semester_instance='2024-ODD'
+        )
+
+    def workloads(self):
+        return [Faculty.objects.get(pk=f.pk).workload_hours for f in (self.faculty, self.other)]
+
+    def test_create_counts_entry(self):
+        self.make_entry(self.slots[0]).save()
+        self.make_entry(self.slots[1]).save()
+        self.assertEqual(self.workloads(), [2, 0])
+
+    def test_resave_without_change_keeps_count(self):
+        entry = self.make_entry(self.slots[0])
+        entry.save()
+        entry.room = 'R101'
+        entry.save()
+        TimetableEntry.objects.get(pk=entry.pk).save()
+        self.assertEqual(self.workloads(), [1, 0])
+
+    def test_reassigning_faculty_moves_count(self):
+        self.make_entry(self.slots[0]).save()
+        entry = TimetableEntry.objects.get(time_slot=self.slots[0])
+        entry.faculty = self.other
+        entry.save()
+        self.assertEqual(self.workloads(), [0, 1])
+
+        # The same instance remembers its new faculty for the next move
+        entry.faculty = self.faculty
+        entry.save()
+        self.assertEqual(self.workloads(), [1, 0])
+
+    def test_saving_unloaded_instance_moves_count(self):
+        entry = self.make_entry(self.slots[0])
+        entry.save()
+        # An instance built by hand for an existing row has never been loaded
+        moved = self.make_entry(self.slots[0], self.other)
+        moved.pk = entry.pk
+        moved.save()
+        self.assertEqual(self.workloads(), [0, 1])
+        self.assertEqual(TimetableEntry.objects.count(), 1)
+
+    def test_saving_bulk_created_instance_moves_count(self):
+        entries = TimetableEntry.objects.bulk_create([
+            self.make_entry(self.slots[0]),
+            self.make_entry(self.slots[1]),
+        ])
+        Faculty.recalculate_workload()
+        entries[0].faculty = self.other
+        entries[0].save()
+        self.assertEqual(self.workloads(), [1, 1])
+
+    def test_delete_removes_count(self):
+        entry = self.make_entry(self.slots[0])
+        entry.save()
+        self.make_entry(self.slots[1]).save()
+        entry.delete()
+        self.assertEqual(self.workloads(), [1, 0])
+
+        TimetableEntry.objects.all().delete()
+        self.assertEqual(self.workloads(), [0, 0])
+
+    def test_count_never_goes_negative(self):
+        entry = self.make_entry(self.slots[0])
+        entry.save()
+        Faculty.objects.filter(pk=self.faculty.pk).update(workload_hours=0)
+        entry.delete()
+        self.assertEqual(self.workloads(), [0, 0])
+
+    def test_recalculate_after_bulk_create(self):
+        TimetableEntry.objects.bulk_create([
+            self.make_entry(self.slots[0]),
+            self.make_entry(self.slots[1]),
+            self.make_entry(self.slots[2], self.other),
+        ])
+        # bulk_create sends no post_save
+        self.assertEqual(self.workloads(), [0, 0])
+
+        self.assertEqual(Faculty.recalculate_workload(), 2)
+        self.assertEqual(self.workloads(), [2, 1])
+
+    def test_recalculate_limited_to_faculty_ids(self):
+        TimetableEntry.objects.bulk_create([
+            self.make_entry(self.slots[0]),
+            self.make_entry(self.slots[1], self.other),
+        ])
+        self.assertEqual(Faculty.recalculate_workload([self.other.pk]), 1)
+        self.assertEqual(self.workloads(), [0, 1])
+
+    def test_recalculate_resets_faculty_without_entries(self):
+        Faculty.objects.filter(pk=self.other.pk).update(workload_hours=5)
+        Faculty.recalculate_workload()
+        self.assertEqual(self.workloads(), [0, 0])
+
+
+class EvolveTests(SimpleTestCase):
+    """The GA loop ranks chromosomes by their exact fitness"""
+
+    def test_selection_only_sees_exact_fitness(self):
+        ga = make_ga(generations=15, crossover_rate=1.0, mutation_rate=0.5)
+        crossover = ga.crossover
+        parents_seen = []
+
+        def checked_crossover(parent1, parent2):
+            for parent in (parent1, parent2):
+                self.assertFalse(parent.dirty)
+                self.assertEqual(parent.fitness, ga.calculate_fitness(parent.copy()))
+            parents_seen.append(parent1)
+            return crossover(parent1, parent2)
+
+        with mock.patch.object(ga, 'crossover', side_effect=checked_crossover):
+            ga.evolve()
+        self.assertTrue(parents_seen)
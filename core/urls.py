@@ -23,6 +23,7 @@ urlpatterns = [
     path('manage/subjects/<int:subject_id>/edit/', views.edit_subject, name='edit_subject'),
     path('manage/toggle-semester/', views.toggle_semester_mode, name='toggle_semester_mode'),
     path('manage/generate-timetable/', views.generate_timetable_view, name='generate_timetable'),
+    path('manage/generate-timetable/<str:task_id>/status/', views.generation_status, name='generation_status'),
     path('manage/init-slots/', views.initialize_time_slots, name='init_time_slots'),
     
     # Faculty Dashboard
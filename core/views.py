@@ -5,20 +5,105 @@ from django.contrib.auth import login, logout, authenticate
 from django.contrib import messages
 from django.http import JsonResponse, HttpResponse
 from django.views.decorators.http import require_POST
-from django.db.models import Count, Q
+from django.utils.cache import patch_cache_control
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.core.cache import cache
+from django.utils import timezone
 from collections import defaultdict
 import json
+import threading
+from datetime import time
+from functools import wraps
+from uuid import uuid4
 
 from .models import (
     Department, Semester, ClassSection, Faculty, Subject,
-    FacultySubjectAssignment, TimeSlot, TimetableEntry, SystemConfiguration
+    TimeSlot, TimetableEntry, SystemConfiguration
 )
-from .genetic_algorithm import generate_timetable
+from .genetic_algorithm import _get_teaching_slots
+from .signals import DASHBOARD_COUNTS_KEY
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; JSON falls back to the stdlib encoder
+    orjson = None
+
+
+# Standard daily slot structure: (period, start, end, type)
+SLOT_STRUCTURE = (
+    (1, time(9, 0), time(9, 50), 'MORNING'),
+    (2, time(9, 50), time(10, 40), 'MORNING'),
+    (3, time(10, 50), time(11, 40), 'MORNING'),
+    (4, time(11, 40), time(12, 30), 'MORNING'),
+    # Lunch break - period=0 indicates non-teaching slot
+    (0, time(12, 30), time(13, 30), 'LUNCH'),
+    (5, time(13, 30), time(14, 20), 'AFTERNOON'),
+    (6, time(14, 20), time(15, 10), 'AFTERNOON'),
+    (7, time(15, 20), time(16, 10), 'AFTERNOON'),
+)
+
+# Teaching week laid out by every timetable grid
+DAYS = ('MON', 'TUE', 'WED', 'THU', 'FRI')
+PERIODS = tuple(range(1, 8))
+DAY_INDEX = {day: i for i, day in enumerate(DAYS)}
+
+# Designation dropdown shared by every faculty row
+DESIGNATION_OPTIONS = tuple(
+    {'value': value, 'label': label} for value, label in Faculty.DESIGNATION_CHOICES
+)
+DESIGNATION_LABELS = dict(Faculty.DESIGNATION_CHOICES)
+
+# Subject type badge classes and labels for the subject list
+SUBJECT_TYPE_BADGES = {
+    'THEORY': 'bg-info',
+    'LAB': 'bg-success',
+    'ELECTIVE': 'bg-warning text-dark'
+}
+SUBJECT_TYPE_DISPLAYS = dict(Subject.SUBJECT_TYPE_CHOICES)
+
+# Semester filter values, as strings to compare against the query parameter
+SEMESTER_NUMBERS = tuple(str(i) for i in range(1, 9))
+
+
+def _to_json(data):
+    """Encode data as a JSON string, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data).decode('utf-8')
+    return json.dumps(data)
+
+
+# Department choices are fixed in code, so their JSON is encoded once
+DEPARTMENT_CHOICES_JSON = _to_json({
+    'departments': [
+        {'code': code, 'name': name}
+        for code, name in Department.get_department_choices()
+    ]
+})
+
+# Seconds the admin dashboard totals may be served from the cache
+DASHBOARD_COUNTS_TIMEOUT = 45
+
+# Background generation runs report their progress through the cache; with
+# several worker processes CACHES must point at a shared backend
+GENERATION_TASK_KEY = 'timetable:task:{}'
+GENERATION_TASK_TIMEOUT = 60 * 60
+
+# One run per department at a time. A run holds the lock for at most this
+# long, and a task still pending after it is taken to have died with its
+# worker process
+GENERATION_LOCK_KEY = 'timetable:generating:{}'
+GENERATION_MAX_SECONDS = 15 * 60
+
+# Prepared timetable_view data: version, semester instance, mode, selected id
+TIMETABLE_VIEW_KEY = 'timetable:view:{}:{}:{}:{}'
+TIMETABLE_VIEW_TIMEOUT = 10 * 60
 
 
 def home(request):
     """Homepage with navigation"""
-    config = SystemConfiguration.objects.first()
+    config = SystemConfiguration.get_config()
     context = {
         'config': config,
     }
@@ -54,27 +139,28 @@ def logout_view(request):
 
 # ============ ADMIN DASHBOARD ============
 
-@login_required
+def staff_required(view):
+    """Send anyone who isn't staff back home before the view does any work"""
+    @wraps(view)
+    @login_required
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_staff:
+            messages.error(request, 'Access denied. Admin privileges required.')
+            return redirect('home')
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+@staff_required
 def admin_dashboard(request):
     """Main admin dashboard"""
-    if not request.user.is_staff:
-        messages.error(request, 'Access denied. Admin privileges required.')
-        return redirect('home')
-    
-    config = SystemConfiguration.objects.first()
-    if not config:
-        config = SystemConfiguration.objects.create()
+    config = SystemConfiguration.get_config()
     
-    departments = Department.objects.all()
-    total_faculty = Faculty.objects.filter(is_active=True).count()
-    total_subjects = Subject.objects.count()
-    total_classes = ClassSection.objects.count()
+    departments = Department.objects.values('id', 'code', 'name')
+    total_faculty, total_subjects, total_classes = _dashboard_counts()
     
     # Get active semesters based on ODD/EVEN mode
-    if config.active_semester_type == 'ODD':
-        active_semesters = Semester.objects.filter(number__in=[1, 3, 5, 7])
-    else:
-        active_semesters = Semester.objects.filter(number__in=[2, 4, 6, 8])
+    active_semesters = Semester.objects.filter(number__in=config.active_semester_numbers)
     
     context = {
         'config': config,
@@ -87,12 +173,34 @@ def admin_dashboard(request):
     return render(request, 'admin/dashboard.html', context)
 
 
-@login_required
+def _dashboard_counts():
+    """
+    Active faculty, subject and class counts, fetched in one round trip.
+    
+    The totals are cached briefly; saves and deletes clear them through
+    signals, and the timeout covers bulk writes that send none.
+    """
+    counts = cache.get(DASHBOARD_COUNTS_KEY)
+    if counts is not None:
+        return counts
+    
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT '
+            f'(SELECT COUNT(*) FROM {qn(Faculty._meta.db_table)} WHERE {qn("is_active")} = %s), '
+            f'(SELECT COUNT(*) FROM {qn(Subject._meta.db_table)}), '
+            f'(SELECT COUNT(*) FROM {qn(ClassSection._meta.db_table)})',
+            [True]
+        )
+        counts = tuple(cursor.fetchone())
+    cache.set(DASHBOARD_COUNTS_KEY, counts, DASHBOARD_COUNTS_TIMEOUT)
+    return counts
+
+
+@staff_required
 def manage_departments(request):
     """Manage departments"""
-    if not request.user.is_staff:
-        return redirect('home')
-    
     if request.method == 'POST':
         action = request.POST.get('action')
         
@@ -111,13 +219,18 @@ def manage_departments(request):
         
         elif action == 'update':
             dept_id = request.POST.get('department_id')
-            dept = Department.objects.get(id=dept_id)
-            dept.name = request.POST.get('name', '').strip()
-            dept.code = request.POST.get('code', '').strip().upper()
-            dept.description = request.POST.get('description', '').strip()
-            dept.is_active = request.POST.get('is_active', '1') == '1'
-            dept.save()
-            messages.success(request, f'Department {dept.code} updated successfully.')
+            code = request.POST.get('code', '').strip().upper()
+            updated = Department.objects.filter(id=dept_id).update(
+                name=request.POST.get('name', '').strip(),
+                code=code,
+                description=request.POST.get('description', '').strip(),
+                is_active=request.POST.get('is_active', '1') == '1'
+            )
+            if updated:
+                TimetableEntry.clear_grid_cache()
+                messages.success(request, f'Department {code} updated successfully.')
+            else:
+                messages.error(request, 'Department not found.')
         
         elif action == 'delete':
             dept_id = request.POST.get('department_id')
@@ -126,12 +239,21 @@ def manage_departments(request):
                 messages.success(request, f'Department {dept.code} deleted successfully.')
                 dept.delete()
     
+    # Count each relation in its own subquery; joining both at once would
+    # multiply every department's semesters by its subjects
+    semester_count = Semester.objects.filter(
+        department=OuterRef('pk')
+    ).order_by().values('department').annotate(total=Count('id')).values('total')
+    subject_count = Subject.objects.filter(
+        department=OuterRef('pk')
+    ).order_by().values('department').annotate(total=Count('id')).values('total')
     departments = Department.objects.annotate(
-        semester_count=Count('semesters'),
-        subject_count=Count('subjects')
+        semester_count=Coalesce(Subquery(semester_count), 0),
+        subject_count=Coalesce(Subquery(subject_count), 0)
     )
     
-    active_count = departments.filter(is_active=True).count()
+    # Iterating fills the queryset's cache, which the template reuses
+    active_count = sum(1 for dept in departments if dept.is_active)
     
     return render(request, 'admin/departments.html', {
         'departments': departments,
@@ -141,32 +263,17 @@ def manage_departments(request):
 
 def get_department_choices(request):
     """API endpoint to get the list of valid department choices"""
-    choices = Department.get_department_choices()
-    return JsonResponse({
-        'departments': [
-            {'code': code, 'name': name}
-            for code, name in choices
-        ]
-    })
+    response = HttpResponse(DEPARTMENT_CHOICES_JSON, content_type='application/json')
+    # The choices are fixed in code, so clients may reuse the response
+    patch_cache_control(response, public=True, max_age=60 * 60)
+    return response
 
 
-@login_required
+@staff_required
 def add_department(request):
     """Add or edit a department - dedicated page with fixed department selection"""
-    if not request.user.is_staff:
-        return redirect('home')
-    
     errors = {}
     form_data = {}
-    department = None
-    
-    # Get the list of valid department choices
-    department_choices = Department.get_department_choices()
-    
-    # Check if editing an existing department
-    edit_id = request.GET.get('edit')
-    if edit_id:
-        department = Department.objects.filter(id=edit_id).first()
     
     if request.method == 'POST':
         action = request.POST.get('action')
@@ -188,51 +295,70 @@ def add_department(request):
             errors['code'] = 'Please select a department'
         elif not Department.is_valid_code(code):
             errors['code'] = 'Invalid department selected. Please choose from the list.'
-        else:
-            # Check for duplicate code (excluding current department if editing)
-            existing = Department.objects.filter(code=code)
-            if action == 'update':
-                dept_id = request.POST.get('department_id')
-                existing = existing.exclude(id=dept_id)
-            if existing.exists():
-                errors['code'] = 'This department has already been added'
         
         if not errors:
-            if action == 'update':
-                # Update existing department
-                dept_id = request.POST.get('department_id')
-                dept = Department.objects.get(id=dept_id)
-                dept.name = name
-                dept.code = code
-                dept.description = description
-                dept.is_active = is_active
-                dept.save()
-                messages.success(request, f'Department "{code} - {name}" updated successfully!')
+            # Department.code is unique, so the database rejects duplicates
+            # without a separate lookup first
+            try:
+                with transaction.atomic():
+                    if action == 'update':
+                        # Update existing department
+                        dept_id = request.POST.get('department_id')
+                        updated = Department.objects.filter(id=dept_id).update(
+                            name=name,
+                            code=code,
+                            description=description,
+                            is_active=is_active
+                        )
+                        if updated:
+                            TimetableEntry.clear_grid_cache()
+                            success_message = f'Department "{code} - {name}" updated successfully!'
+                        else:
+                            success_message = None
+                    else:
+                        # Create new department
+                        Department.objects.create(
+                            name=name,
+                            code=code,
+                            description=description,
+                            is_active=is_active
+                        )
+                        success_message = f'Department "{code} - {name}" created successfully!'
+            except IntegrityError:
+                # Only a code already taken is the form's fault
+                duplicates = Department.objects.filter(code=code)
+                if action == 'update':
+                    duplicates = duplicates.exclude(id=request.POST.get('department_id'))
+                if not duplicates.exists():
+                    raise
+                errors['code'] = 'This department has already been added'
             else:
-                # Create new department
-                Department.objects.create(
-                    name=name,
-                    code=code,
-                    description=description,
-                    is_active=is_active
-                )
-                messages.success(request, f'Department "{code} - {name}" created successfully!')
-            return redirect('manage_departments')
+                # The UPDATE's row count says whether the department existed,
+                # so no lookup is needed beforehand
+                if success_message:
+                    messages.success(request, success_message)
+                else:
+                    messages.error(request, 'Department not found.')
+                return redirect('manage_departments')
+    
+    # Check if editing an existing department; only the form needs this and
+    # the choices, so a successful POST skips both
+    department = None
+    edit_id = request.GET.get('edit')
+    if edit_id:
+        department = Department.objects.filter(id=edit_id).first()
     
     return render(request, 'admin/add_department.html', {
         'errors': errors,
         'form_data': form_data,
         'department': department,
-        'department_choices': department_choices
+        'department_choices': Department.get_department_choices()
     })
 
 
-@login_required
+@staff_required
 def manage_semesters(request):
     """Manage semesters and classes"""
-    if not request.user.is_staff:
-        return redirect('home')
-    
     if request.method == 'POST':
         action = request.POST.get('action')
         
@@ -268,14 +394,9 @@ def manage_semesters(request):
     return render(request, 'admin/semesters.html', {'departments': departments})
 
 
-@login_required
+@staff_required
 def add_semester(request):
     """Add a new semester with classes - dedicated page"""
-    from django.db import transaction
-    
-    if not request.user.is_staff:
-        return redirect('home')
-    
     errors = {}
     form_data = {}
     classes_data = []
@@ -332,18 +453,15 @@ def add_semester(request):
             errors['classes'] = class_errors
         
         if dept_id and number and not errors:
-            # Check if semester already exists
-            existing = Semester.objects.filter(department_id=dept_id, number=number).exists()
-            if existing:
-                errors['number'] = f'Semester {number} already exists for this department'
-            else:
-                try:
-                    with transaction.atomic():
-                        # Create the semester
-                        semester = Semester.objects.create(department_id=dept_id, number=number)
-                        
-                        # Create all classes
-                        classes_created = 0
+            try:
+                with transaction.atomic():
+                    # (number, department) is unique, so the lookup and insert
+                    # can't race another admin adding the same semester
+                    semester, created = Semester.objects.get_or_create(department_id=dept_id, number=number)
+                    
+                    if created:
+                        # Create all classes in one INSERT
+                        new_sections = []
                         for cls in classes_data:
                             class_name = cls['name'].strip()
                             if class_name:
@@ -351,12 +469,15 @@ def add_semester(request):
                                 section = cls['section'].strip()
                                 full_name = f"{class_name} {section}".strip() if section else class_name
                                 
-                                ClassSection.objects.create(
+                                new_sections.append(ClassSection(
                                     semester=semester,
                                     name=full_name,
                                     capacity=60  # Default capacity
-                                )
-                                classes_created += 1
+                                ))
+                        ClassSection.objects.bulk_create(new_sections, batch_size=100)
+                        cache.delete(DASHBOARD_COUNTS_KEY)
+                        TimetableEntry.clear_grid_cache()
+                        classes_created = len(new_sections)
                         
                         if classes_created > 0:
                             messages.success(request, f'Semester S{number} created with {classes_created} class(es).')
@@ -364,11 +485,13 @@ def add_semester(request):
                             messages.success(request, f'Semester S{number} created successfully.')
                         
                         return redirect('manage_semesters')
-                        
-                except Exception as e:
-                    errors['general'] = f'An error occurred: {str(e)}'
+                
+                errors['number'] = f'Semester {number} already exists for this department'
+            
+            except Exception as e:
+                errors['general'] = f'An error occurred: {str(e)}'
     
-    departments = Department.objects.filter(is_active=True)
+    departments = Department.objects.filter(is_active=True).values('id', 'code', 'name')
     selected_dept = request.GET.get('department')
     
     # Initialize with one empty class row if no classes data
@@ -384,12 +507,9 @@ def add_semester(request):
     })
 
 
-@login_required
+@staff_required
 def add_class(request):
     """Add a new class section - dedicated page"""
-    if not request.user.is_staff:
-        return redirect('home')
-    
     if request.method == 'POST':
         semester_id = request.POST.get('semester_id')
         name = request.POST.get('name', '').strip()
@@ -418,12 +538,9 @@ def add_class(request):
     })
 
 
-@login_required
+@staff_required
 def manage_faculty(request):
     """Manage faculty members"""
-    if not request.user.is_staff:
-        return redirect('home')
-    
     if request.method == 'POST':
         action = request.POST.get('action')
         
@@ -440,15 +557,23 @@ def manage_faculty(request):
         
         elif action == 'update':
             faculty_id = request.POST.get('faculty_id')
-            faculty = Faculty.objects.get(id=faculty_id)
-            faculty.name = request.POST.get('name')
-            faculty.email = request.POST.get('email')
-            faculty.designation = request.POST.get('designation')
             department_id = request.POST.get('department_id')
-            faculty.department_id = department_id if department_id else None
-            faculty.preferences = request.POST.get('preferences', '')
-            faculty.save()
-            messages.success(request, 'Faculty updated successfully.')
+            preferences = request.POST.get('preferences', '')
+            # update() skips Faculty.save(), so parse the preferences here
+            updated = Faculty.objects.filter(id=faculty_id).update(
+                name=request.POST.get('name'),
+                email=request.POST.get('email'),
+                designation=request.POST.get('designation'),
+                department_id=department_id if department_id else None,
+                preferences=preferences,
+                preference_codes=Faculty.parse_preferences(preferences)
+            )
+            if updated:
+                Faculty.clear_user_cache()
+                TimetableEntry.clear_grid_cache()
+                messages.success(request, 'Faculty updated successfully.')
+            else:
+                messages.error(request, 'Faculty not found.')
         
         elif action == 'delete':
             faculty_id = request.POST.get('faculty_id')
@@ -457,62 +582,45 @@ def manage_faculty(request):
         
         elif action == 'toggle_active':
             faculty_id = request.POST.get('faculty_id')
-            faculty = Faculty.objects.get(id=faculty_id)
-            faculty.is_active = not faculty.is_active
-            faculty.save()
-    
-    # Pre-compute all display data for template (no comparisons in template)
-    designation_labels = {
-        'PROFESSOR': 'Professor',
-        'ASSOCIATE_PROFESSOR': 'Associate Professor',
-        'ASSISTANT_PROFESSOR': 'Assistant Professor',
-    }
+            Faculty.objects.filter(id=faculty_id).update(is_active=~F('is_active'))
+            # update() sends no signals, so clear what they would have
+            Faculty.clear_user_cache()
+            TimetableEntry.clear_grid_cache()
+            cache.delete(DASHBOARD_COUNTS_KEY)
     
     # Fetch departments for dropdown
-    departments = list(Department.objects.filter(is_active=True).order_by('code'))
+    departments = list(Department.objects.filter(is_active=True).order_by('code').values('id', 'code', 'name'))
+    
+    # Plain rows are enough for the table, so skip building model instances
+    faculty_rows = Faculty.objects.values(
+        'id', 'name', 'email', 'designation', 'is_active', 'department_id', 'department__name'
+    ).order_by('designation', 'name')
     
     faculty_list = []
-    for f in Faculty.objects.select_related('department').order_by('designation', 'name'):
-        # Build designation options with selected flag
-        desig_options = [
-            {'value': 'PROFESSOR', 'label': 'Professor', 'selected': f.designation == 'PROFESSOR'},
-            {'value': 'ASSOCIATE_PROFESSOR', 'label': 'Associate Professor', 'selected': f.designation == 'ASSOCIATE_PROFESSOR'},
-            {'value': 'ASSISTANT_PROFESSOR', 'label': 'Assistant Professor', 'selected': f.designation == 'ASSISTANT_PROFESSOR'},
-        ]
-        
-        # Build department options with selected flag for this faculty
-        dept_options = []
-        for dept in departments:
-            dept_options.append({
-                'id': dept.id,
-                'name': dept.name,
-                'code': dept.code,
-                'selected': f.department_id == dept.id if f.department_id else False
-            })
-        
+    for row in faculty_rows:
         faculty_list.append({
-            'id': f.id,
-            'name': f.name,
-            'email': f.email,
-            'designation_display': designation_labels.get(f.designation, f.designation),
-            'department_display': f.department.name if f.department else '',
-            'status_display': 'Active' if f.is_active else 'Inactive',
-            'desig_options': desig_options,
-            'dept_options': dept_options,
+            'id': row['id'],
+            'name': row['name'],
+            'email': row['email'],
+            'designation_display': DESIGNATION_LABELS.get(row['designation'], row['designation']),
+            'department_display': row['department__name'] or '',
+            'status_display': 'Active' if row['is_active'] else 'Inactive',
+            # Every row's dropdowns share the same option lists; only the
+            # selected value differs
+            'selected_dept_id': row['department_id'],
+            'selected_designation': row['designation'],
         })
     
     return render(request, 'admin/faculty.html', {
         'faculty_list': faculty_list,
-        'departments': departments
+        'departments': departments,
+        'designation_options': DESIGNATION_OPTIONS
     })
 
 
-@login_required
+@staff_required
 def manage_subjects(request):
     """Manage subjects with department and semester filtering"""
-    if not request.user.is_staff:
-        return redirect('home')
-    
     # Handle delete action
     if request.method == 'POST':
         action = request.POST.get('action')
@@ -529,110 +637,116 @@ def manage_subjects(request):
     selected_sem = request.GET.get('semester', '')
     
     # Build department options with selected attribute (for template)
-    departments = Department.objects.filter(is_active=True).order_by('code')
+    departments = Department.objects.filter(is_active=True).order_by('code').values_list('code', 'name')
     department_options = []
-    for dept in departments:
+    for code, name in departments:
         department_options.append({
-            'code': dept.code,
-            'name': dept.name,
-            'selected': 'selected' if selected_dept == dept.code else ''
-        })
-    
-    # Build semester options with selected attribute
-    semester_options = []
-    for i in range(1, 9):
-        semester_options.append({
-            'value': str(i),
-            'selected': 'selected' if selected_sem == str(i) else ''
+            'code': code,
+            'name': name,
+            'selected': 'selected' if selected_dept == code else ''
         })
     
-    # Build subjects query
-    subjects = Subject.objects.select_related('department', 'semester')
+    # Build subjects query; flat rows carry everything the table shows
+    subjects = Subject.objects.all()
     
     if selected_dept:
         subjects = subjects.filter(department__code=selected_dept)
     if selected_sem:
         subjects = subjects.filter(semester__number=selected_sem)
     
-    subjects = subjects.order_by('department__code', 'semester__number', 'code')
-    
-    # Type badge mapping
-    type_badges = {
-        'THEORY': 'bg-info',
-        'LAB': 'bg-success',
-        'ELECTIVE': 'bg-warning text-dark'
-    }
-    type_displays = {
-        'THEORY': 'Theory',
-        'LAB': 'Lab',
-        'ELECTIVE': 'Elective'
-    }
+    subjects = subjects.order_by('department__code', 'semester__number', 'code').values(
+        'id', 'code', 'name', 'subject_type', 'credits',
+        'lecture_hours', 'tutorial_hours', 'practical_hours',
+        'department_id', 'department__code', 'department__name',
+        'semester_id', 'semester__number'
+    )
     
-    # Group subjects by department and semester
+    # Group subjects by department and semester in one pass. Plain dicts,
+    # not defaultdicts: the template's .items lookup would add a key to one
     grouped_subjects = {}
-    for subject in subjects:
-        dept_code = subject.department.code
-        dept_id = subject.department.id
-        sem_num = subject.semester.number
-        sem_id = subject.semester.id
-
-        if dept_code not in grouped_subjects:
-            grouped_subjects[dept_code] = {
-                'name': subject.department.name,
-                'id': dept_id,
-                'semesters': {}
-            }
-
-        if sem_num not in grouped_subjects[dept_code]['semesters']:
-            grouped_subjects[dept_code]['semesters'][sem_num] = {
-                'subjects': [],
-                'id': sem_id
-            }
+    for row in subjects:
+        dept_group = grouped_subjects.setdefault(row['department__code'], {
+            'name': row['department__name'],
+            'id': row['department_id'],
+            'semesters': {}
+        })
+        sem_group = dept_group['semesters'].setdefault(row['semester__number'], {
+            'subjects': [],
+            'id': row['semester_id']
+        })
         
         # Add subject with display info
-        grouped_subjects[dept_code]['semesters'][sem_num]['subjects'].append({
-            'id': subject.id,
-            'code': subject.code,
-            'name': subject.name,
-            'ltp_string': subject.ltp_string,
-            'hours_per_week': subject.hours_per_week,
-            'credits': subject.credits,
-            'type_badge': type_badges.get(subject.subject_type, 'bg-secondary'),
-            'type_display': type_displays.get(subject.subject_type, subject.subject_type)
+        lecture, tutorial, practical = row['lecture_hours'], row['tutorial_hours'], row['practical_hours']
+        sem_group['subjects'].append({
+            'id': row['id'],
+            'code': row['code'],
+            'name': row['name'],
+            'ltp_string': f'{lecture}-{tutorial}-{practical}',
+            'hours_per_week': lecture + tutorial + practical,
+            'credits': row['credits'],
+            'type_badge': SUBJECT_TYPE_BADGES.get(row['subject_type'], 'bg-secondary'),
+            'type_display': SUBJECT_TYPE_DISPLAYS.get(row['subject_type'], row['subject_type'])
         })
     
-    # Get counts
-    total_subjects = Subject.objects.count()
-    theory_count = Subject.objects.filter(subject_type='THEORY').count()
-    lab_count = Subject.objects.filter(subject_type='LAB').count()
-    elective_count = Subject.objects.filter(subject_type='ELECTIVE').count()
+    # Get all counts in one query
+    totals = Subject.objects.aggregate(
+        total=Count('id'),
+        theory=Count('id', filter=Q(subject_type='THEORY')),
+        lab=Count('id', filter=Q(subject_type='LAB')),
+        elective=Count('id', filter=Q(subject_type='ELECTIVE'))
+    )
     
     return render(request, 'admin/subjects.html', {
         'grouped_subjects': grouped_subjects,
         'department_options': department_options,
-        'semester_options': semester_options,
-        'total_subjects': total_subjects,
-        'theory_count': theory_count,
-        'lab_count': lab_count,
-        'elective_count': elective_count,
+        'semester_numbers': SEMESTER_NUMBERS,
+        'selected_sem': selected_sem,
+        'total_subjects': totals['total'],
+        'theory_count': totals['theory'],
+        'lab_count': totals['lab'],
+        'elective_count': totals['elective'],
     })
 
 
-@login_required
+def _semesters_by_dept(semester_numbers):
+    """Semester ids and numbers grouped by department id, for the form's JavaScript"""
+    semesters_by_dept = defaultdict(list)
+    rows = Semester.objects.filter(number__in=semester_numbers).values(
+        'id', 'number', 'department_id'
+    ).order_by('department_id', 'number')
+    for row in rows:
+        semesters_by_dept[str(row['department_id'])].append({'id': row['id'], 'number': row['number']})
+    return semesters_by_dept
+
+
+def _subject_save_errors(code, department_id, semester_id, subject_id=None):
+    """
+    Form errors explaining why saving a subject raised IntegrityError.
+    
+    Saves skip these lookups on the happy path; they only run once the
+    database has refused the row. Returns an empty dict when none of the
+    form's fields is to blame.
+    """
+    duplicates = Subject.objects.filter(code=code)
+    if subject_id is not None:
+        duplicates = duplicates.exclude(id=subject_id)
+    if duplicates.exists():
+        return {'code': 'Subject code already exists'}
+    if not Department.objects.filter(id=department_id).exists():
+        return {'department': 'Select a valid department'}
+    if not Semester.objects.filter(id=semester_id).exists():
+        return {'semester': 'Select a valid semester'}
+    return {}
+
+
+@staff_required
 def add_subject(request):
     """Add a new subject - supports context-aware pre-filling via query params"""
-    if not request.user.is_staff:
-        return redirect('home')
-    
     # Get system configuration to determine active semester type
-    config = SystemConfiguration.objects.first()
-    if config and config.active_semester_type == 'ODD':
-        semester_numbers = [1, 3, 5, 7]
-    else:
-        semester_numbers = [2, 4, 6, 8]
+    config = SystemConfiguration.get_config()
+    semester_numbers = config.active_semester_numbers
     
-    departments = Department.objects.filter(is_active=True).order_by('code')
-    semesters = Semester.objects.filter(number__in=semester_numbers).select_related('department').order_by('department__code', 'number')
+    departments = Department.objects.filter(is_active=True).order_by('code').only('id', 'code', 'name')
     
     # Check for preset department and semester from query params
     preset_dept_id = request.GET.get('dept')
@@ -650,12 +764,7 @@ def add_subject(request):
             preset_dept = preset_sem.department
     
     # Build semester data for JavaScript
-    semesters_by_dept = {}
-    for sem in semesters:
-        dept_id = str(sem.department.id)
-        if dept_id not in semesters_by_dept:
-            semesters_by_dept[dept_id] = []
-        semesters_by_dept[dept_id].append({'id': sem.id, 'number': sem.number})
+    semesters_by_dept = _semesters_by_dept(semester_numbers)
     
     errors = {}
     form_data = {
@@ -683,8 +792,6 @@ def add_subject(request):
         
         if not code:
             errors['code'] = 'Subject code is required'
-        elif Subject.objects.filter(code=code).exists():
-            errors['code'] = 'Subject code already exists'
         if not name:
             errors['name'] = 'Subject name is required'
         if not department_id:
@@ -693,16 +800,25 @@ def add_subject(request):
             errors['semester'] = 'Select a semester'
         
         if not errors:
-            Subject.objects.create(
-                code=code, name=name, department_id=department_id,
-                semester_id=semester_id, subject_type=subject_type,
-                lecture_hours=int(lecture_hours), tutorial_hours=int(tutorial_hours),
-                practical_hours=int(practical_hours), credits=int(credits)
-            )
-            messages.success(request, f'Subject "{code}" added successfully!')
-            if preset_dept:
-                return redirect(f"{reverse('manage_subjects')}?department={preset_dept.code}")
-            return redirect('manage_subjects')
+            # Subject.code is unique and the ids are foreign keys, so the
+            # database rejects bad rows without separate lookups first
+            try:
+                with transaction.atomic():
+                    Subject.objects.create(
+                        code=code, name=name, department_id=department_id,
+                        semester_id=semester_id, subject_type=subject_type,
+                        lecture_hours=int(lecture_hours), tutorial_hours=int(tutorial_hours),
+                        practical_hours=int(practical_hours), credits=int(credits)
+                    )
+            except IntegrityError:
+                errors = _subject_save_errors(code, department_id, semester_id)
+                if not errors:
+                    raise
+            else:
+                messages.success(request, f'Subject "{code}" added successfully!')
+                if preset_dept:
+                    return redirect(f"{reverse('manage_subjects')}?department={preset_dept.code}")
+                return redirect('manage_subjects')
     
     # Prepare department options with selected attribute
     selected_dept_id = form_data.get('department_id', '')
@@ -727,7 +843,7 @@ def add_subject(request):
         'page_title': 'Add Subject',
         'submit_label': 'Save Subject',
         'department_options': department_options,
-        'semesters_by_dept': json.dumps(semesters_by_dept),
+        'semesters_by_dept': _to_json(semesters_by_dept),
         'type_options': type_options,
         'errors': errors,
         'form_data': form_data,
@@ -740,31 +856,19 @@ def add_subject(request):
     })
 
 
-@login_required
+@staff_required
 def edit_subject(request, subject_id):
     """Edit an existing subject"""
-    if not request.user.is_staff:
-        return redirect('home')
-    
     subject = get_object_or_404(Subject, id=subject_id)
     
     # Get system configuration to determine active semester type
-    config = SystemConfiguration.objects.first()
-    if config and config.active_semester_type == 'ODD':
-        semester_numbers = [1, 3, 5, 7]
-    else:
-        semester_numbers = [2, 4, 6, 8]
+    config = SystemConfiguration.get_config()
+    semester_numbers = config.active_semester_numbers
     
-    departments = Department.objects.filter(is_active=True).order_by('code')
-    semesters = Semester.objects.filter(number__in=semester_numbers).select_related('department').order_by('department__code', 'number')
+    departments = Department.objects.filter(is_active=True).order_by('code').only('id', 'code', 'name')
     
     # Build semester data for JavaScript
-    semesters_by_dept = {}
-    for sem in semesters:
-        dept_id = str(sem.department.id)
-        if dept_id not in semesters_by_dept:
-            semesters_by_dept[dept_id] = []
-        semesters_by_dept[dept_id].append({'id': sem.id, 'number': sem.number})
+    semesters_by_dept = _semesters_by_dept(semester_numbers)
     
     errors = {}
     
@@ -800,8 +904,6 @@ def edit_subject(request, subject_id):
         
         if not code:
             errors['code'] = 'Subject code is required'
-        elif Subject.objects.filter(code=code).exclude(id=subject_id).exists():
-            errors['code'] = 'Subject code already exists'
         if not name:
             errors['name'] = 'Subject name is required'
         
@@ -815,9 +917,20 @@ def edit_subject(request, subject_id):
             subject.tutorial_hours = int(tutorial_hours)
             subject.practical_hours = int(practical_hours)
             subject.credits = int(credits)
-            subject.save()
-            messages.success(request, f'Subject "{code}" updated!')
-            return redirect('manage_subjects')
+            # A code taken by another subject or a stale id trips a constraint
+            try:
+                with transaction.atomic():
+                    subject.save(update_fields=[
+                        'code', 'name', 'department', 'semester', 'subject_type',
+                        'lecture_hours', 'tutorial_hours', 'practical_hours', 'credits'
+                    ])
+            except IntegrityError:
+                errors = _subject_save_errors(code, department_id, semester_id, subject.id)
+                if not errors:
+                    raise
+            else:
+                messages.success(request, f'Subject "{code}" updated!')
+                return redirect('manage_subjects')
     
     # Prepare department options with selected attribute
     department_options = []
@@ -842,7 +955,7 @@ def edit_subject(request, subject_id):
         'submit_label': 'Update Subject',
         'subject': subject,
         'department_options': department_options,
-        'semesters_by_dept': json.dumps(semesters_by_dept),
+        'semesters_by_dept': _to_json(semesters_by_dept),
         'type_options': type_options,
         'errors': errors,
         'form_data': form_data,
@@ -860,14 +973,14 @@ def toggle_semester_mode(request):
     if not request.user.is_staff:
         return JsonResponse({'error': 'Access denied'}, status=403)
     
-    config = SystemConfiguration.objects.first()
-    if not config:
-        config = SystemConfiguration.objects.create()
+    config = SystemConfiguration.get_config()
     
     mode = request.POST.get('mode')
     if mode in ['ODD', 'EVEN']:
         config.active_semester_type = mode
-        config.save()
+        # config may come from the cache, so write back only this column
+        # rather than every (possibly stale) one
+        config.save(update_fields=['active_semester_type'])
         return JsonResponse({'success': True, 'mode': mode})
     
     return JsonResponse({'error': 'Invalid mode'}, status=400)
@@ -884,25 +997,76 @@ def generate_timetable_view(request):
     
     if not department_id:
         return JsonResponse({'error': 'Department ID required'}, status=400)
-    
-    config = SystemConfiguration.objects.first()
-    semester_instance = config.get_semester_instance() if config else '2024-ODD'
+    try:
+        department_id = int(department_id)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid department ID'}, status=400)
+    
+    config = SystemConfiguration.get_config()
+    semester_instance = config.get_semester_instance()
+    
+    # Run the GA off the request thread and let the page poll for the result
+    task_id = uuid4().hex
+    if not cache.add(GENERATION_LOCK_KEY.format(department_id), task_id, GENERATION_MAX_SECONDS):
+        return JsonResponse(
+            {'error': 'A timetable is already being generated for this department'}, status=409
+        )
+    cache.set(
+        GENERATION_TASK_KEY.format(task_id),
+        {'ready': False, 'started': timezone.now()},
+        GENERATION_TASK_TIMEOUT
+    )
+    threading.Thread(
+        target=_run_generation_task,
+        args=(task_id, department_id, semester_instance),
+        daemon=True
+    ).start()
+    return JsonResponse({'task_id': task_id}, status=202)
+
+
+def _run_generation_task(task_id, department_id, semester_instance):
+    """Generate a department timetable and store the outcome for polling"""
+    from .genetic_algorithm import generate_department_timetable
     
     try:
-        from .genetic_algorithm import generate_department_timetable
-        result = generate_department_timetable(int(department_id), semester_instance)
-        return JsonResponse(result)
+        result = generate_department_timetable(department_id, semester_instance)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
-
+        result = {'success': False, 'error': str(e)}
+    finally:
+        # The thread opened its own connection; don't leave it dangling
+        connection.close()
+    cache.set(GENERATION_TASK_KEY.format(task_id), {'ready': True, 'result': result}, GENERATION_TASK_TIMEOUT)
+    
+    # Release the department unless the lock expired and a newer run holds it
+    lock_key = GENERATION_LOCK_KEY.format(department_id)
+    if cache.get(lock_key) == task_id:
+        cache.delete(lock_key)
 
 
 @login_required
-def initialize_time_slots(request):
-    """Initialize fixed time slots with validation"""
+def generation_status(request, task_id):
+    """Report whether a background timetable generation has finished"""
     if not request.user.is_staff:
-        return redirect('home')
+        return JsonResponse({'error': 'Access denied'}, status=403)
+    
+    status = cache.get(GENERATION_TASK_KEY.format(task_id))
+    if status is None:
+        return JsonResponse({'error': 'Unknown task'}, status=404)
     
+    # The thread dies silently with its process, so a run that outlived its
+    # lock is reported as failed rather than left pending
+    if not status['ready'] and (timezone.now() - status['started']).total_seconds() > GENERATION_MAX_SECONDS:
+        status = {'ready': True, 'result': {
+            'success': False,
+            'error': 'Generation did not finish; the server may have restarted. Please try again.'
+        }}
+    return JsonResponse(status)
+
+
+
+@staff_required
+def initialize_time_slots(request):
+    """Initialize fixed time slots with validation"""
     # Check if slots already exist
     slots_count = TimeSlot.objects.count()
     
@@ -924,9 +1088,10 @@ def initialize_time_slots(request):
                 messages.error(request, 'Cannot re-initialize: Active timetables exist. Delete them first from Django Admin.')
                 return redirect('init_time_slots')
             
-            # Delete existing slots
-            TimeSlot.objects.all().delete()
-            _create_time_slots()
+            # Replace existing slots in one transaction
+            with transaction.atomic():
+                TimeSlot.objects.all().delete()
+                _create_time_slots()
             messages.success(request, f'Time slots re-initialized successfully! Created {TimeSlot.objects.count()} slots.')
             return redirect('admin_dashboard')
     
@@ -988,33 +1153,23 @@ def _get_type_display(slot_type):
 
 def _create_time_slots():
     """Internal function to create standard time slot configuration"""
-    from datetime import time
-    
-    days = ['MON', 'TUE', 'WED', 'THU', 'FRI']
-    
-    # Define slot structure: (period, start, end, type)
-    slot_structure = [
-        (1, time(9, 0), time(9, 50), 'MORNING'),
-        (2, time(9, 50), time(10, 40), 'MORNING'),
-        (3, time(10, 50), time(11, 40), 'MORNING'),
-        (4, time(11, 40), time(12, 30), 'MORNING'),
-        # Lunch break - period=0 indicates non-teaching slot
-        (0, time(12, 30), time(13, 30), 'LUNCH'),
-        (5, time(13, 30), time(14, 20), 'AFTERNOON'),
-        (6, time(14, 20), time(15, 10), 'AFTERNOON'),
-        (7, time(15, 20), time(16, 10), 'AFTERNOON'),
-    ]
-    
-    for day in days:
-        for period, start, end, slot_type in slot_structure:
-            TimeSlot.objects.create(
-                day=day,
-                period=period,
-                start_time=start,
-                end_time=end,
-                slot_type=slot_type,
-                is_locked=True
-            )
+    # bulk_create skips save(), so the duration is filled in here
+    TimeSlot.objects.bulk_create([
+        TimeSlot(
+            day=day,
+            period=period,
+            start_time=start,
+            end_time=end,
+            slot_type=slot_type,
+            is_locked=True,
+            duration_minutes=TimeSlot.minutes_between(start, end)
+        )
+        for day in DAYS
+        for period, start, end, slot_type in SLOT_STRUCTURE
+    ])
+    # ...and sends no post_save, so drop the cached teaching slots too
+    _get_teaching_slots.cache_clear()
+    TimetableEntry.clear_grid_cache()
 
 
 # ============ FACULTY DASHBOARD ============
@@ -1022,59 +1177,45 @@ def _create_time_slots():
 @login_required
 def faculty_dashboard(request):
     """Faculty dashboard - view timetable and manage preferences"""
-    try:
-        faculty = Faculty.objects.get(user=request.user)
-    except Faculty.DoesNotExist:
+    faculty = Faculty.for_user(request.user)
+    if faculty is None:
         messages.error(request, 'No faculty profile linked to this account.')
         return redirect('home')
     
-    config = SystemConfiguration.objects.first()
-    semester_instance = config.get_semester_instance() if config else '2024-ODD'
+    config = SystemConfiguration.get_config()
+    semester_instance = config.get_semester_instance()
     
-    # Get faculty's timetable entries
+    # Get entries where the faculty teaches or assists in one query
     entries = TimetableEntry.objects.filter(
-        faculty=faculty,
+        Q(faculty=faculty) | Q(assistant_faculty=faculty),
         semester_instance=semester_instance
-    ).select_related('class_section', 'subject', 'time_slot').order_by('time_slot')
+    ).select_related(
+        'class_section__semester__department', 'subject', 'time_slot'
+    ).only(
+        'faculty_id', 'is_lab_session', 'time_slot__day', 'time_slot__period', 'subject__code',
+        'class_section__name', 'class_section__semester__number',
+        'class_section__semester__department__code'
+    ).order_by('time_slot')
     
-    # Also get entries where faculty is assistant
-    assistant_entries = TimetableEntry.objects.filter(
-        assistant_faculty=faculty,
-        semester_instance=semester_instance
-    ).select_related('class_section', 'subject', 'time_slot')
-    
-    # Build timetable grid
-    days = ['MON', 'TUE', 'WED', 'THU', 'FRI']
-    periods = range(1, 8)
-    
-    timetable_grid = {day: {p: None for p in periods} for day in days}
+    # Build timetable grid as one flat, period-major list of cells
+    grid_cells = [None] * (len(PERIODS) * len(DAYS))
     
     for entry in entries:
-        day = entry.time_slot.day
-        period = entry.time_slot.period
-        timetable_grid[day][period] = {
-            'subject': entry.subject.code,
-            'class': str(entry.class_section),
-            'type': 'main',
-            'is_lab': entry.is_lab_session
-        }
-    
-    for entry in assistant_entries:
-        day = entry.time_slot.day
-        period = entry.time_slot.period
-        if timetable_grid[day][period] is None:
-            timetable_grid[day][period] = {
+        i = (entry.time_slot.period - 1) * len(DAYS) + DAY_INDEX[entry.time_slot.day]
+        is_main = entry.faculty_id == faculty.id
+        # Teaching takes the cell over an assisted session in the same slot
+        if is_main or grid_cells[i] is None:
+            grid_cells[i] = {
                 'subject': entry.subject.code,
                 'class': str(entry.class_section),
-                'type': 'assistant',
+                'type': 'main' if is_main else 'assistant',
                 'is_lab': entry.is_lab_session
             }
     
     context = {
         'faculty': faculty,
-        'timetable_grid': timetable_grid,
-        'days': days,
-        'periods': periods,
+        'timetable_rows': _grid_rows(grid_cells),
+        'days': DAYS,
         'config': config,
     }
     return render(request, 'faculty/dashboard.html', context)
@@ -1084,14 +1225,15 @@ def faculty_dashboard(request):
 @require_POST
 def update_preferences(request):
     """Update faculty preferences"""
-    try:
-        faculty = Faculty.objects.get(user=request.user)
-    except Faculty.DoesNotExist:
+    faculty = Faculty.for_user(request.user)
+    if faculty is None:
         return JsonResponse({'error': 'Faculty not found'}, status=404)
     
+    # The profile may come from the cache, so write back only this field
+    # rather than every (possibly stale) column
     preferences = request.POST.get('preferences', '')
     faculty.preferences = preferences
-    faculty.save()
+    faculty.save(update_fields=['preferences'])
     
     return JsonResponse({'success': True})
 
@@ -1103,13 +1245,21 @@ def timetable_view(request):
     view_mode = request.GET.get('mode', 'department')  # 'department' or 'faculty'
     selected_id = request.GET.get('id')
     
-    config = SystemConfiguration.objects.first()
+    config = SystemConfiguration.get_config()
     
-    # Prepare data based on mode - ALL FILTERING/GROUPING IN BACKEND
-    if view_mode == 'department':
-        context = _prepare_department_view(selected_id, config)
-    else:
-        context = _prepare_faculty_view(selected_id, config)
+    # The prepared data changes only with the timetable version (replaced on
+    # any edit to what the grids show), so a hit skips every query below
+    cache_key = TIMETABLE_VIEW_KEY.format(
+        TimetableEntry.grid_cache_version(), config.get_semester_instance(), view_mode, selected_id or ''
+    )
+    context = cache.get(cache_key)
+    if context is None:
+        # Prepare data based on mode - ALL FILTERING/GROUPING IN BACKEND
+        if view_mode == 'department':
+            context = _prepare_department_view(selected_id, config)
+        else:
+            context = _prepare_faculty_view(selected_id, config)
+        cache.set(cache_key, context, TIMETABLE_VIEW_TIMEOUT)
     
     context['view_mode'] = view_mode
     context['config'] = config
@@ -1126,7 +1276,7 @@ def _prepare_department_view(department_id, config):
     semester_instance = config.get_semester_instance() if config else '2024-ODD'
     
     # Get all departments for selection
-    departments = Department.objects.filter(is_active=True).order_by('code')
+    departments = Department.objects.filter(is_active=True).order_by('code').only('id', 'code', 'name')
     departments_list = []
     for dept in departments:
         departments_list.append({
@@ -1160,7 +1310,7 @@ def _prepare_department_view(department_id, config):
         return result
     
     # Determine semester numbers based on active type
-    semester_numbers = [1, 3, 5, 7] if config and config.active_semester_type == 'ODD' else [2, 4, 6, 8]
+    semester_numbers = config.active_semester_numbers
     
     # Get semesters for this department
     semesters = Semester.objects.filter(
@@ -1185,7 +1335,10 @@ def _prepare_department_view(department_id, config):
             entries = TimetableEntry.objects.filter(
                 class_section=class_section,
                 semester_instance=semester_instance
-            ).select_related('subject', 'faculty', 'time_slot', 'assistant_faculty')
+            ).select_related('subject', 'faculty', 'time_slot', 'assistant_faculty').only(
+                'is_lab_session', 'time_slot__day', 'time_slot__period', 'subject__code',
+                'subject__name', 'faculty__name', 'assistant_faculty__name'
+            )
             
             if not entries.exists():
                 continue  # Skip classes with no timetable generated yet
@@ -1256,7 +1409,13 @@ def _prepare_faculty_view(faculty_id, config):
     entries = TimetableEntry.objects.filter(
         Q(faculty_id=faculty_id) | Q(assistant_faculty_id=faculty_id),
         semester_instance=semester_instance
-    ).select_related('class_section', 'subject', 'time_slot', 'faculty', 'assistant_faculty')
+    ).select_related(
+        'class_section__semester__department', 'subject', 'time_slot'
+    ).only(
+        'assistant_faculty_id', 'is_lab_session', 'time_slot__day', 'time_slot__period',
+        'subject__code', 'subject__name', 'class_section__name',
+        'class_section__semester__number', 'class_section__semester__department__code'
+    )
     
     if entries.exists():
         result['timetable_grid'] = _build_timetable_grid(entries, 'faculty', faculty_id)
@@ -1265,6 +1424,15 @@ def _prepare_faculty_view(faculty_id, config):
     return result
 
 
+def _grid_rows(cells):
+    """Split a flat, period-major list of cells into one row per period"""
+    width = len(DAYS)
+    return [
+        {'period': period, 'cells': cells[i * width:(i + 1) * width]}
+        for i, period in enumerate(PERIODS)
+    ]
+
+
 def _build_timetable_grid(entries, view_type, faculty_id=None):
     """
     Build timetable grid structure with pre-processed, ready-to-display data.
@@ -1293,16 +1461,13 @@ def _build_timetable_grid(entries, view_type, faculty_id=None):
             ]
         }, ...]
     """
-    days = ['MON', 'TUE', 'WED', 'THU', 'FRI']
-    periods = range(1, 8)
-    
     # Get period times from database (no hardcoding)
     period_times = _get_period_times()
     
     # Build grid data
     grid_data = []
     
-    for period in periods:
+    for period in PERIODS:
         period_row = {
             'period_number': period,
             'period_time': period_times.get(period, ''),
@@ -1310,7 +1475,7 @@ def _build_timetable_grid(entries, view_type, faculty_id=None):
             'days': []
         }
         
-        for day in days:
+        for day in DAYS:
             # Initialize empty cell
             cell = {
                 'day_code': day,
@@ -1371,10 +1536,34 @@ def _get_period_times():
     return {slot['period']: slot['start_time'].strftime('%H:%M') for slot in slots}
 
 
-def export_timetable_pdf(request):
-    """Export timetable as PDF"""
+def _render_pdf(html):
+    """
+    Convert rendered HTML to PDF bytes, or None if conversion failed.
+    
+    WeasyPrint lays the page out in C and is much faster than xhtml2pdf, so
+    it is used when installed; xhtml2pdf remains the fallback.
+    """
+    try:
+        from weasyprint import HTML
+    except (ImportError, OSError):
+        # OSError: installed, but the cairo/pango system libraries are missing
+        HTML = None
+    
+    if HTML is not None:
+        return HTML(string=html).write_pdf()
+    
     from io import BytesIO
     from xhtml2pdf import pisa
+    
+    result = BytesIO()
+    pdf = pisa.CreatePDF(html, dest=result, encoding='utf-8')
+    if pdf.err:
+        return None
+    return result.getvalue()
+
+
+def export_timetable_pdf(request):
+    """Export timetable as PDF"""
     from django.template.loader import get_template
     
     view_type = request.GET.get('type', 'class')
@@ -1383,27 +1572,26 @@ def export_timetable_pdf(request):
     if not selected_id:
         return HttpResponse('No selection made', status=400)
     
-    config = SystemConfiguration.objects.first()
-    semester_instance = config.get_semester_instance() if config else '2024-ODD'
+    config = SystemConfiguration.get_config()
+    semester_instance = config.get_semester_instance()
     
-    days = ['MON', 'TUE', 'WED', 'THU', 'FRI']
-    periods = range(1, 8)
+    # Flat, period-major list of cells; split into rows once at the end
+    grid_cells = [None] * (len(PERIODS) * len(DAYS))
     
     if view_type == 'class':
         class_section = ClassSection.objects.get(id=selected_id)
         entries = TimetableEntry.objects.filter(
             class_section_id=selected_id,
             semester_instance=semester_instance
-        ).select_related('subject', 'faculty', 'time_slot')
+        ).values('time_slot__day', 'time_slot__period', 'subject__code', 'faculty__name', 'is_lab_session')
         
-        timetable_grid = {day: {p: None for p in periods} for day in days}
-        for entry in entries:
-            day = entry.time_slot.day
-            period = entry.time_slot.period
-            timetable_grid[day][period] = {
-                'subject': entry.subject.code,
-                'faculty': entry.faculty.name[:10],
-                'is_lab': entry.is_lab_session
+        # Read once, so stream rows instead of filling the result cache
+        for entry in entries.iterator(chunk_size=200):
+            i = (entry['time_slot__period'] - 1) * len(DAYS) + DAY_INDEX[entry['time_slot__day']]
+            grid_cells[i] = {
+                'subject': entry['subject__code'],
+                'faculty': entry['faculty__name'][:10],
+                'is_lab': entry['is_lab_session']
             }
         
         title = f"Timetable - {class_section}"
@@ -1412,13 +1600,17 @@ def export_timetable_pdf(request):
         entries = TimetableEntry.objects.filter(
             Q(faculty_id=selected_id) | Q(assistant_faculty_id=selected_id),
             semester_instance=semester_instance
-        ).select_related('class_section', 'subject', 'time_slot')
+        ).select_related(
+            'class_section__semester__department', 'subject', 'time_slot'
+        ).only(
+            'is_lab_session', 'time_slot__day', 'time_slot__period', 'subject__code',
+            'class_section__name', 'class_section__semester__number',
+            'class_section__semester__department__code'
+        )
         
-        timetable_grid = {day: {p: None for p in periods} for day in days}
-        for entry in entries:
-            day = entry.time_slot.day
-            period = entry.time_slot.period
-            timetable_grid[day][period] = {
+        for entry in entries.iterator(chunk_size=200):
+            i = (entry.time_slot.period - 1) * len(DAYS) + DAY_INDEX[entry.time_slot.day]
+            grid_cells[i] = {
                 'subject': entry.subject.code,
                 'class': str(entry.class_section),
                 'is_lab': entry.is_lab_session
@@ -1429,18 +1621,15 @@ def export_timetable_pdf(request):
     template = get_template('timetable/pdf_template.html')
     html = template.render({
         'title': title,
-        'timetable_grid': timetable_grid,
-        'days': days,
-        'periods': periods,
+        'timetable_rows': _grid_rows(grid_cells),
+        'days': DAYS,
         'config': config
     })
     
-    result = BytesIO()
-    pdf = pisa.pisaDocument(BytesIO(html.encode('utf-8')), result)
-    
-    if pdf.err:
+    pdf_bytes = _render_pdf(html)
+    if pdf_bytes is None:
         return HttpResponse('Error generating PDF', status=500)
     
-    response = HttpResponse(result.getvalue(), content_type='application/pdf')
+    response = HttpResponse(pdf_bytes, content_type='application/pdf')
     response['Content-Disposition'] = f'attachment; filename="{title.replace(" ", "_")}.pdf"'
     return response